@@ -18,6 +18,24 @@ class Config:
         "info": "#1982C4",                    # 信息色
     }
 
+    # SQLite storage profile, applied to every pooled connection
+    STORAGE_PROFILE = {
+        "journal_mode": "WAL",       # Readers (exports, stats) don't block writers
+        "synchronous": "NORMAL",     # Safe with WAL, avoids an fsync per commit
+        "busy_timeout": 5000,        # ms to wait on a locked database
+        "mmap_size": 268435456,      # 256 MB memory-mapped I/O
+        "cache_size": -20000,        # Negative = KiB, ~20 MB page cache
+        "temp_store": "MEMORY",
+        "pool_size": 5,
+        "write_coalesce_ms": 300,    # Window for merging note edits into one commit
+        "log_retention_days": 365,   # Older operation logs are rolled up per day; 0 keeps all
+        "log_prune_batch_size": 1000,
+        "backup_interval_minutes": 60, # Online backups (core/backup.py); 0 disables
+        "backup_keep_hourly": 24,    # Newest backup kept for each of the last N hours
+        "backup_keep_daily": 7,      # ... days
+        "backup_keep_weekly": 4,     # ... weeks
+    }
+
     def __init__(self):
         self.config_path = os.path.join(DATA_DIR, "config.json")
         self.settings = self.load_settings()
@@ -48,9 +66,16 @@ class Config:
                 "auto_start": False,
                 "auto_hide": True,
                 "show_note_actions": True
-            }
+            },
+            "storage": dict(self.STORAGE_PROFILE)
         }
 
+    def get_storage_profile(self):
+        # Fill in keys missing from older config files
+        profile = dict(self.STORAGE_PROFILE)
+        profile.update(self.settings.get("storage", {}))
+        return profile
+
     def save_settings(self):
         try:
             with open(self.config_path, 'w', encoding='utf-8') as f:
@@ -1,5 +1,6 @@
 import sys
 import os
+import multiprocessing
 
 # Add project root to sys.path
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -10,7 +11,11 @@ from PySide6.QtWidgets import QApplication
 from PySide6.QtNetwork import QLocalServer, QLocalSocket
 from ui.main_window import MainWindow
 from ui.styles.themes import ThemeManager
-from core.database import init_db
+from core.database import init_db, flush_pending_writes
+from core.db_worker import get_db_worker
+from core.note_manager import NoteManager
+from core.note_store import get_note_store
+from core.backup import BackupService
 
 def main():
     # Initialize Database
@@ -49,6 +54,16 @@ def main():
     window = MainWindow()
     window.show()
     
+    # Roll old operation logs into daily counts in the background
+    get_db_worker().submit(NoteManager().prune_logs)
+    
+    # Scheduled online backups; a restore swaps the data under the note list
+    backups = BackupService(parent=app)
+    backups.restored.connect(lambda _: get_note_store().load())
+    # The log's id cursor means nothing against the restored rows; start over
+    backups.restored.connect(lambda _: window.log_tab.refresh_logs())
+    backups.start()
+    
     # Handle incoming connections (requests to show window)
     def handle_new_connection():
         client_socket = server.nextPendingConnection()
@@ -70,10 +85,17 @@ def main():
             
     server.newConnection.connect(handle_new_connection)
     
+    # Write out any buffered note edits, then stop the database thread
+    app.aboutToQuit.connect(flush_pending_writes)
+    app.aboutToQuit.connect(backups.stop)
+    app.aboutToQuit.connect(get_db_worker().stop)
+    
     # Ensure Qt is imported for WindowState constants
     from PySide6.QtCore import Qt
     
     sys.exit(app.exec())
 
 if __name__ == "__main__":
+    # Lets the bundled executable start import worker processes (core/import_manager.py)
+    multiprocessing.freeze_support()
     main()
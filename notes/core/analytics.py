@@ -0,0 +1,193 @@
+from .database import engine, flush_pending_writes, data_revision
+from .models import (DailyStats, OperationLog, WorkLog, Tag, Note, note_tags, worklog_tags,
+                     STATUS_COMPLETED)
+from sqlalchemy import String, func, select, type_coerce
+import numpy as np
+import pandas as pd
+
+# Productivity analytics over the full history. Each source is read with one
+# columnar query into a DataFrame and everything else is vectorized. Day series
+# come from daily_stats (it survives log retention), timestamps from the
+# operation log, tag totals from worklogs and notes joined to their tags.
+# Results are cached per data revision (a counter bumped on every commit), so
+# repeated reads are free until something is written.
+
+ROLLING_WINDOW = 7 # days
+
+def parse_times(values):
+    # Timestamps are stored as text in two formats (with and without microseconds)
+    return pd.to_datetime(values, format="ISO8601", errors="coerce")
+
+class ProductivityAnalytics:
+    def __init__(self, bind=engine):
+        self.bind = bind
+        self.cache = {} # name -> (revision, result)
+        self.logs = None # every operation log row read so far, in id order
+        self.last_log = None # (action_type, raw created_at) of the last row read
+
+    def cached(self, name, compute):
+        # Buffered edits are committed first so they count towards the revision
+        flush_pending_writes()
+        revision = data_revision()
+        hit = self.cache.get(name)
+        if hit is not None and hit[0] == revision:
+            return hit[1]
+        result = compute()
+        self.cache[name] = (revision, result)
+        return result
+
+    def read_frame(self, stmt):
+        with self.bind.connect() as conn:
+            return pd.read_sql_query(stmt, conn)
+
+    # --- Sources (one query each) ---
+
+    def daily_frame(self):
+        # daily_stats on a continuous day index (missing days filled with 0)
+        def load():
+            frame = self.read_frame(select(
+                DailyStats.day, DailyStats.work_minutes, DailyStats.notes_created,
+                DailyStats.notes_completed, DailyStats.notes_deleted,
+            ).order_by(DailyStats.day))
+            if frame.empty:
+                return frame.set_index("day")
+            frame["day"] = pd.to_datetime(frame["day"])
+            frame = frame.set_index("day")
+            full_range = pd.date_range(frame.index.min(), pd.Timestamp.today().normalize(), freq="D")
+            return frame.reindex(full_range, fill_value=0)
+        return self.cached("daily_frame", load)
+
+    def log_frame(self):
+        # New entries get higher ids, so after a write usually just the new tail is
+        # read. Ids are reused once the newest rows are gone (clear, restore), so
+        # the rows already read are only kept while their count matches and the
+        # last of them is still the same entry; otherwise everything is reloaded.
+        def load():
+            previous = self.logs
+            created_at = type_coerce(OperationLog.created_at, String)
+            with self.bind.connect() as conn:
+                if previous is not None and not previous.empty:
+                    last_id = int(previous["id"].iloc[-1])
+                    kept = conn.execute(select(func.count()).select_from(OperationLog)
+                                        .where(OperationLog.id <= last_id)).scalar()
+                    last = conn.execute(select(OperationLog.action_type, created_at)
+                                        .where(OperationLog.id == last_id)).first()
+                    if kept != len(previous) or last is None or tuple(last) != self.last_log:
+                        previous, last_id = None, 0
+                else:
+                    previous, last_id = None, 0
+                tail = pd.read_sql_query(select(
+                    OperationLog.id, OperationLog.note_id, OperationLog.action_type,
+                    created_at.label("created_at"),
+                ).where(OperationLog.id > last_id).order_by(OperationLog.id), conn)
+            if not tail.empty:
+                self.last_log = (tail["action_type"].iloc[-1], tail["created_at"].iloc[-1])
+            tail["created_at"] = parse_times(tail["created_at"])
+            self.logs = tail if previous is None else pd.concat([previous, tail], ignore_index=True)
+            return self.logs.dropna(subset=["created_at"])
+        return self.cached("log_frame", load)
+
+    # --- Results ---
+
+    def rolling_averages(self, window=ROLLING_WINDOW):
+        # Per-day work minutes and completions with their trailing `window`-day means
+        def compute():
+            daily = self.daily_frame()
+            if daily.empty:
+                return pd.DataFrame(columns=["work_minutes", "work_minutes_avg",
+                                             "notes_completed", "notes_completed_avg"])
+            result = daily[["work_minutes", "notes_completed"]].copy()
+            rolling = result.rolling(window, min_periods=1).mean()
+            result["work_minutes_avg"] = rolling["work_minutes"]
+            result["notes_completed_avg"] = rolling["notes_completed"]
+            return result
+        return self.cached(f"rolling_averages:{window}", compute)
+
+    def completion_streaks(self):
+        # {"current": days, "longest": days} of consecutive days with a completion;
+        # the current streak still counts when today has none yet
+        def compute():
+            daily = self.daily_frame()
+            if daily.empty:
+                return {"current": 0, "longest": 0}
+            active = daily["notes_completed"].to_numpy() > 0
+            # Run lengths of consecutive active days: reset the cumulative count at every gap
+            counts = np.cumsum(active)
+            resets = np.maximum.accumulate(np.where(active, 0, counts))
+            runs = counts - resets
+            current = int(runs[-1]) if active[-1] else (int(runs[-2]) if len(runs) > 1 else 0)
+            return {"current": current, "longest": int(runs.max())}
+        return self.cached("completion_streaks", compute)
+
+    def hour_heatmap(self, action_type="complete"):
+        # 7 x 24 counts (Monday first, hour of day) of log entries of `action_type`;
+        # None counts every action
+        def compute():
+            logs = self.log_frame()
+            if action_type is not None:
+                logs = logs[logs["action_type"] == action_type]
+            heatmap = np.zeros((7, 24), dtype=np.int64)
+            times = logs["created_at"]
+            np.add.at(heatmap, (times.dt.weekday.to_numpy(), times.dt.hour.to_numpy()), 1)
+            return heatmap
+        return self.cached(f"hour_heatmap:{action_type}", compute)
+
+    def median_time_to_complete(self):
+        # Median time from a note's creation to its first completion, as a
+        # Timedelta (None without data). Needs log entries carrying note_id.
+        def compute():
+            logs = self.log_frame().dropna(subset=["note_id"]).sort_values(["created_at", "id"])
+            # Note ids are reused after the newest note is deleted: number each
+            # id's lifetimes by the delete entries before it, so one note's
+            # creation is never paired with a later note's completion
+            deleted = (logs["action_type"] == "delete").astype(np.int64)
+            logs = logs.assign(lifetime=deleted.groupby(logs["note_id"]).cumsum() - deleted)
+            firsts = logs[logs["action_type"].isin(("create", "complete"))] \
+                .pivot_table(index=["note_id", "lifetime"], columns="action_type", values="created_at",
+                             aggfunc="min")
+            if "create" not in firsts or "complete" not in firsts:
+                return None
+            durations = (firsts["complete"] - firsts["create"]).dropna()
+            durations = durations[durations >= pd.Timedelta(0)]
+            return durations.median() if not durations.empty else None
+        return self.cached("median_time_to_complete", compute)
+
+    def tag_breakdown(self):
+        # Per tag: minutes worked, notes tagged and how many of those are completed
+        def compute():
+            work = self.read_frame(
+                select(Tag.name.label("tag"), WorkLog.duration_minutes)
+                .join(worklog_tags, worklog_tags.c.tag_id == Tag.id)
+                .join(WorkLog, WorkLog.id == worklog_tags.c.worklog_id)
+            )
+            notes = self.read_frame(
+                select(Tag.name.label("tag"), Note.status)
+                .join(note_tags, note_tags.c.tag_id == Tag.id)
+                .join(Note, Note.id == note_tags.c.note_id)
+                .where(Note.is_deleted == False)
+            )
+            minutes = work.groupby("tag")["duration_minutes"].sum()
+            notes["completed"] = notes["status"] == STATUS_COMPLETED
+            note_counts = notes.groupby("tag").agg(notes=("status", "size"), completed=("completed", "sum"))
+            result = pd.concat([minutes.rename("work_minutes"), note_counts], axis=1).fillna(0)
+            return result.astype(np.int64).sort_values("work_minutes", ascending=False)
+        return self.cached("tag_breakdown", compute)
+
+    def report(self, days=30):
+        # Everything a dashboard needs, recent rows only for the day series
+        return {
+            "rolling": self.rolling_averages().tail(days),
+            "streaks": self.completion_streaks(),
+            "heatmap": self.hour_heatmap(),
+            "median_time_to_complete": self.median_time_to_complete(),
+            "tags": self.tag_breakdown(),
+        }
+
+_analytics = None
+
+def get_analytics():
+    # Shared instance so every caller benefits from the same cache
+    global _analytics
+    if _analytics is None:
+        _analytics = ProductivityAnalytics()
+    return _analytics
@@ -0,0 +1,84 @@
+from sqlalchemy import bindparam, event, inspect
+from datetime import datetime
+from .database import SessionLocal
+from .models import Note, OperationLog, STATUS_COMPLETED
+from . import daily_stats
+
+# Operation log rows are written in the same transaction as the change they
+# describe, so a commit either records both or neither.
+#
+# ORM changes to notes are picked up by the after_flush hook below. Set-based
+# statements (bulk insert/update/delete) skip the unit of work and report their
+# changes through record_many / forget_notes instead.
+#
+# Entries point at their note by id and leave note_content empty while the note
+# exists; readers look the title up. Deleting a note copies its title into its
+# entries, so the log still reads correctly afterwards.
+#
+# Every log write also bumps the per-day counters in daily_stats.
+
+EMPTY_TITLE = "Empty Note"
+
+log_table = OperationLog.__table__
+
+insert_logs = log_table.insert()
+
+# Snapshot the title into entries that still rely on the note for it
+snapshot_titles = log_table.update().where(
+    log_table.c.note_id == bindparam("deleted_id"),
+    log_table.c.note_content.is_(None),
+).values(note_content=bindparam("title"))
+
+def log_row(action_type, note_id, content=None, created_at=None):
+    # Use local time for created_at to ensure UI shows correct Beijing Time (or system time)
+    return {"action_type": action_type, "note_id": note_id, "note_content": content,
+            "created_at": created_at or datetime.now()}
+
+# `db` below may be a Session or a Connection in the caller's transaction
+
+def write_logs(db, rows):
+    if rows:
+        db.execute(insert_logs, rows)
+        daily_stats.bump(db, daily_stats.count_log_rows(rows))
+
+def record_many(db, action_type, entries):
+    # Batched log rows: one executemany INSERT.
+    # `entries` are (note_id, content) pairs; content only for deleted notes.
+    now = datetime.now()
+    write_logs(db, [log_row(action_type, note_id, content, now) for note_id, content in entries])
+
+def forget_notes(db, notes):
+    # Call with (note_id, title) pairs for notes deleted by a set-based statement
+    rows = [{"deleted_id": note_id, "title": title or EMPTY_TITLE} for note_id, title in notes]
+    if rows:
+        db.execute(snapshot_titles, rows)
+    record_many(db, "delete", [(note_id, title or EMPTY_TITLE) for note_id, title in notes])
+
+def note_actions(note):
+    # Audit actions implied by the changes just flushed for a persistent note
+    state = inspect(note)
+    status = state.attrs.status.history
+    if status.added and status.added[0] == STATUS_COMPLETED and STATUS_COMPLETED not in status.deleted:
+        yield "complete"
+    deleted = state.attrs.is_deleted.history
+    if deleted.added and not deleted.added[0] and deleted.deleted and deleted.deleted[0]:
+        yield "restore"
+
+@event.listens_for(SessionLocal, "after_flush")
+def audit_note_changes(session, flush_context):
+    # new/dirty/deleted and attribute history still describe the flush here, and
+    # new notes already have their ids
+    now = datetime.now()
+    rows = []
+    for obj in session.new:
+        if isinstance(obj, Note):
+            rows.append(log_row("create", obj.id, created_at=now))
+    for obj in session.dirty:
+        if isinstance(obj, Note):
+            rows += [log_row(action, obj.id, created_at=now) for action in note_actions(obj)]
+
+    connection = session.connection()
+    write_logs(connection, rows)
+    deleted = [(obj.id, obj.title) for obj in session.deleted if isinstance(obj, Note)]
+    if deleted:
+        forget_notes(connection, deleted)
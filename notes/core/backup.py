@@ -0,0 +1,221 @@
+from PySide6.QtCore import QObject, QTimer, Signal
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+import os
+import re
+import sqlite3
+import zipfile
+from .database import engine, flush_pending_writes, invalidate_caches
+from .db_worker import get_db_worker
+from app.constants import DATA_DIR, DB_PATH
+from app.config import app_config
+from utils.file_utils import get_backup_filename
+
+# Online backups of the SQLite database.
+#
+# A snapshot is copied with SQLite's backup API a few pages per step. In WAL mode
+# the source connection holds one read transaction for the whole copy: writers
+# keep going (their pages land in the WAL) and the copy sees a single consistent
+# state. Without that read transaction every concurrent write would restart the
+# copy from the first page. The snapshot is then zipped as backup_<time>.zip
+# and old archives are thinned out (newest per hour / day / week).
+
+BACKUP_DIR = os.path.join(DATA_DIR, "backups")
+BACKUP_PAGES_PER_STEP = 256
+BACKUP_ENTRY = "worklog.db" # file name inside the archive
+BACKUP_NAME_RE = re.compile(r"^backup_(\d{8}_\d{6})(?:_\d+)?\.zip$")
+
+def snapshot_database(source_path, target_path, pages=BACKUP_PAGES_PER_STEP, progress=None):
+    # progress(copied_pages, total_pages) after every step
+    source = sqlite3.connect(source_path, isolation_level=None, check_same_thread=False)
+    target = sqlite3.connect(target_path)
+    try:
+        wal = source.execute("PRAGMA journal_mode").fetchone()[0].lower() == "wal"
+        if wal:
+            # Pin one snapshot for the whole copy; doesn't block writers in WAL mode
+            source.execute("BEGIN")
+            source.execute("SELECT count(*) FROM sqlite_master").fetchall()
+
+        def on_step(status, remaining, total):
+            if progress:
+                progress(total - remaining, total)
+
+        source.backup(target, pages=pages, progress=on_step, sleep=0.05)
+        if wal:
+            source.execute("COMMIT")
+    finally:
+        target.close()
+        source.close()
+
+class BackupManager:
+    def __init__(self, db_path=DB_PATH, backup_dir=BACKUP_DIR, profile=None):
+        self.db_path = db_path
+        self.backup_dir = backup_dir
+        self.profile = profile or app_config.get_storage_profile()
+
+    def list_backups(self):
+        # [(taken_at, path)], newest first
+        if not os.path.isdir(self.backup_dir):
+            return []
+        backups = []
+        for name in os.listdir(self.backup_dir):
+            match = BACKUP_NAME_RE.match(name)
+            if match:
+                taken_at = datetime.strptime(match.group(1), "%Y%m%d_%H%M%S")
+                backups.append((taken_at, os.path.join(self.backup_dir, name)))
+        backups.sort(reverse=True)
+        return backups
+
+    def next_backup_path(self):
+        name = get_backup_filename()
+        path = os.path.join(self.backup_dir, name)
+        counter = 1
+        while os.path.exists(path):
+            # Two backups within the same second
+            path = os.path.join(self.backup_dir, f"{name[:-4]}_{counter}.zip")
+            counter += 1
+        return path
+
+    def create_backup(self, progress=None, rotate=True):
+        # Safe while the app is writing. Returns the archive path.
+        flush_pending_writes()
+        os.makedirs(self.backup_dir, exist_ok=True)
+        path = self.next_backup_path()
+        snapshot_path = path + ".db"
+        try:
+            snapshot_database(self.db_path, snapshot_path, progress=progress)
+            with zipfile.ZipFile(path + ".tmp", "w", zipfile.ZIP_DEFLATED) as archive:
+                archive.write(snapshot_path, BACKUP_ENTRY)
+            os.replace(path + ".tmp", path)
+        finally:
+            for leftover in (snapshot_path, path + ".tmp"):
+                if os.path.exists(leftover):
+                    os.remove(leftover)
+        if rotate:
+            self.rotate()
+        return path
+
+    def rotate(self, now=None):
+        # Keeps the newest backup of each of the last N hours, days and ISO weeks
+        # (N from the storage profile), plus the newest overall. Returns removed paths.
+        now = now or datetime.now()
+        backups = self.list_backups()
+        keep = {path for _, path in backups[:1]}
+        policies = (
+            (self.profile["backup_keep_hourly"], lambda t: t.replace(minute=0, second=0, microsecond=0),
+             timedelta(hours=1)),
+            (self.profile["backup_keep_daily"], lambda t: t.date(), timedelta(days=1)),
+            (self.profile["backup_keep_weekly"], lambda t: t.isocalendar()[:2], timedelta(weeks=1)),
+        )
+        for count, period, length in policies:
+            oldest = now - length * count
+            seen = set()
+            for taken_at, path in backups:
+                if taken_at > oldest and period(taken_at) not in seen:
+                    seen.add(period(taken_at))
+                    keep.add(path)
+        removed = [path for _, path in backups if path not in keep]
+        for path in removed:
+            os.remove(path)
+        return removed
+
+    def restore(self, path):
+        # Replaces the live database with the archive's contents. The current
+        # state is backed up first, so a restore can itself be undone.
+        # Run on the database worker so no app write interleaves with it.
+        os.makedirs(self.backup_dir, exist_ok=True)
+        snapshot_path = os.path.join(self.backup_dir, ".restore.db")
+        try:
+            with zipfile.ZipFile(path) as archive:
+                with archive.open(BACKUP_ENTRY) as source, open(snapshot_path, "wb") as target:
+                    while True:
+                        block = source.read(1024 * 1024)
+                        if not block:
+                            break
+                        target.write(block)
+            check = sqlite3.connect(snapshot_path)
+            try:
+                result = check.execute("PRAGMA quick_check").fetchone()[0]
+            except sqlite3.DatabaseError as e:
+                result = str(e)
+            finally:
+                check.close()
+            if result != "ok":
+                raise ValueError(f"Backup {os.path.basename(path)} is damaged: {result}")
+
+            # Not rotated: it would share an hour with, and evict, recent archives
+            # (possibly the one being restored)
+            self.create_backup(rotate=False)
+            source = sqlite3.connect(snapshot_path)
+            target = sqlite3.connect(self.db_path, timeout=self.profile["busy_timeout"] / 1000)
+            try:
+                source.backup(target) # one step: holds the write lock briefly
+            finally:
+                target.close()
+                source.close()
+        finally:
+            if os.path.exists(snapshot_path):
+                os.remove(snapshot_path)
+
+        # Pooled connections and derived caches describe the old contents;
+        # older backups may also predate the current schema
+        from .migrations import run_migrations
+        engine.dispose()
+        run_migrations(engine)
+        invalidate_caches()
+
+class BackupService(QObject):
+    # Runs backups on their own thread (never the GUI thread, and not the
+    # database worker, which would hold up note edits for the whole copy) and
+    # schedules them every backup_interval_minutes.
+    backup_finished = Signal(str) # archive path
+    backup_failed = Signal(str) # error message
+    restored = Signal(str) # archive path; the database has new contents
+
+    def __init__(self, manager=None, parent=None):
+        super().__init__(parent)
+        self.manager = manager or BackupManager()
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.running = None
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.backup_now)
+
+    def start(self):
+        interval = self.manager.profile["backup_interval_minutes"]
+        if interval <= 0:
+            return
+        self.timer.start(interval * 60 * 1000)
+        backups = self.manager.list_backups()
+        if not backups or backups[0][0] < datetime.now() - timedelta(minutes=interval):
+            # Overdue; wait until startup work has settled
+            QTimer.singleShot(30 * 1000, self.backup_now)
+
+    def backup_now(self):
+        if self.running is not None and not self.running.done():
+            return self.running
+        # Buffered edits belong to this thread; write them before the snapshot
+        flush_pending_writes()
+        self.running = self.executor.submit(self.manager.create_backup)
+        self.running.add_done_callback(self.on_backup_done)
+        return self.running
+
+    def on_backup_done(self, future):
+        # Called on the backup thread; signals are queued to the GUI thread
+        error = future.exception()
+        if error is None:
+            self.backup_finished.emit(future.result())
+        else:
+            print(f"Backup failed: {error}")
+            self.backup_failed.emit(str(error))
+
+    def restore(self, path):
+        flush_pending_writes()
+        return get_db_worker().submit(
+            self.manager.restore, path,
+            on_success=lambda _: self.restored.emit(path),
+            on_error=lambda e: self.backup_failed.emit(str(e)),
+        )
+
+    def stop(self):
+        self.timer.stop()
+        self.executor.shutdown(wait=True)
@@ -0,0 +1,119 @@
+from datetime import timezone
+from sqlalchemy import event, func, inspect
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from .database import SessionLocal
+from .models import DailyStats, OperationLog, OperationLogDaily, WorkLog
+
+# daily_stats holds one row per day and is kept current in the same transaction
+# as the change being counted: note activity through the operation log writes
+# in core/audit.py, minutes worked through the WorkLog flush hook below.
+# rebuild() recomputes it from the raw tables.
+
+STAT_COLUMNS = ("work_minutes", "notes_created", "notes_completed", "notes_deleted")
+
+# Operation log action -> daily_stats column
+ACTION_COLUMNS = {
+    "create": "notes_created",
+    "complete": "notes_completed",
+    "delete": "notes_deleted",
+}
+
+def day_key(value):
+    # Operation log times are local
+    return value.date().isoformat()
+
+def work_day_key(value):
+    # WorkLog.date is naive UTC (utcnow default, imports convert to UTC); count
+    # the minutes on the local day like everything else in daily_stats
+    return value.replace(tzinfo=timezone.utc).astimezone().date().isoformat()
+
+def _upsert():
+    stmt = sqlite_insert(DailyStats)
+    return stmt.on_conflict_do_update(
+        index_elements=[DailyStats.day],
+        set_={column: getattr(DailyStats, column) + stmt.excluded[column] for column in STAT_COLUMNS},
+    )
+
+upsert_stats = _upsert()
+
+def bump(db, deltas):
+    # `deltas` maps (day, column) -> amount; one executemany upsert, one row per day.
+    # `db` may be a Session or a Connection in the caller's transaction.
+    per_day = {}
+    for (day, column), amount in deltas.items():
+        if amount:
+            row = per_day.setdefault(day, dict.fromkeys(STAT_COLUMNS, 0))
+            row[column] += amount
+    if per_day:
+        db.execute(upsert_stats, [{"day": day, **row} for day, row in per_day.items()])
+
+def count_log_rows(rows):
+    # Deltas for operation log rows as passed to insert (see audit.log_row)
+    deltas = {}
+    for row in rows:
+        column = ACTION_COLUMNS.get(row["action_type"])
+        if column:
+            key = (day_key(row["created_at"]), column)
+            deltas[key] = deltas.get(key, 0) + 1
+    return deltas
+
+def worklog_deltas(session):
+    # Minutes added/removed by the WorkLog changes in this flush
+    deltas = {}
+
+    def add(log_date, minutes):
+        if log_date is not None and minutes:
+            key = (work_day_key(log_date), "work_minutes")
+            deltas[key] = deltas.get(key, 0) + minutes
+
+    for obj in session.new:
+        if isinstance(obj, WorkLog):
+            add(obj.date, obj.duration_minutes)
+    for obj in session.deleted:
+        if isinstance(obj, WorkLog):
+            add(obj.date, -(obj.duration_minutes or 0))
+    for obj in session.dirty:
+        if isinstance(obj, WorkLog):
+            state = inspect(obj)
+            date_history = state.attrs.date.history
+            minutes_history = state.attrs.duration_minutes.history
+            if not (date_history.has_changes() or minutes_history.has_changes()):
+                continue
+            old_date = date_history.deleted[0] if date_history.deleted else obj.date
+            old_minutes = minutes_history.deleted[0] if minutes_history.deleted else obj.duration_minutes
+            add(old_date, -(old_minutes or 0))
+            add(obj.date, obj.duration_minutes)
+    return deltas
+
+@event.listens_for(SessionLocal, "after_flush")
+def track_work_minutes(session, flush_context):
+    deltas = worklog_deltas(session)
+    if deltas:
+        bump(session.connection(), deltas)
+
+def rebuild(db):
+    # Recompute every row from worklogs and the operation log (raw rows plus
+    # the per-day rollups left by log retention). Runs in the caller's transaction.
+    db.query(DailyStats).delete()
+    deltas = {}
+
+    def add(day, column, amount):
+        key = (day, column)
+        deltas[key] = deltas.get(key, 0) + (amount or 0)
+
+    work_day = func.date(WorkLog.date, "localtime") # as work_day_key
+    for day, minutes in db.query(work_day, func.sum(WorkLog.duration_minutes)) \
+            .filter(WorkLog.date.isnot(None)).group_by(work_day):
+        add(day, "work_minutes", minutes)
+
+    log_day = func.date(OperationLog.created_at)
+    log_counts = db.query(log_day, OperationLog.action_type, func.count()) \
+        .filter(OperationLog.action_type.in_(ACTION_COLUMNS)).group_by(log_day, OperationLog.action_type)
+    rollup_counts = db.query(OperationLogDaily.day, OperationLogDaily.action_type, OperationLogDaily.count) \
+        .filter(OperationLogDaily.action_type.in_(ACTION_COLUMNS))
+    for rows in (log_counts, rollup_counts):
+        for day, action_type, count in rows:
+            add(day, ACTION_COLUMNS[action_type], count)
+
+    bump(db, deltas)
+    return len({day for day, _ in deltas})
@@ -1,14 +1,75 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.constants import DB_PATH
+from app.config import app_config
 
 DATABASE_URL = f"sqlite:///{DB_PATH}"
 
-engine = create_engine(DATABASE_URL, echo=False)
+storage_profile = app_config.get_storage_profile()
+
+# Pooled connections are reused across get_db() calls instead of reconnecting each time.
+# check_same_thread is off so pooled connections can be handed to worker threads.
+engine = create_engine(
+    DATABASE_URL,
+    echo=False,
+    pool_size=storage_profile["pool_size"],
+    connect_args={"check_same_thread": False},
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
+PRAGMA_KEYS = ("journal_mode", "synchronous", "busy_timeout", "mmap_size", "cache_size", "temp_store")
+
+def apply_storage_profile(dbapi_connection, profile):
+    cursor = dbapi_connection.cursor()
+    try:
+        for key in PRAGMA_KEYS:
+            value = profile.get(key)
+            if value is not None:
+                cursor.execute(f"PRAGMA {key}={value}")
+    finally:
+        cursor.close()
+
+@event.listens_for(engine, "connect")
+def on_connect(dbapi_connection, connection_record):
+    # Runs once per new pooled connection, not per session.
+    # Disable pysqlite's own transaction handling so BEGIN is emitted by SQLAlchemy
+    # below; otherwise DDL in migrations would run outside the transaction.
+    dbapi_connection.isolation_level = None
+    apply_storage_profile(dbapi_connection, storage_profile)
+
+@event.listens_for(engine, "begin")
+def on_begin(conn):
+    conn.exec_driver_sql("BEGIN")
+
+# Bumped on every commit through the engine; caches of derived data key on it
+_data_revision = 0
+
+@event.listens_for(engine, "commit")
+def on_commit(conn):
+    global _data_revision
+    _data_revision += 1
+
+def data_revision():
+    return _data_revision
+
+def invalidate_caches():
+    # For changes made outside the engine (e.g. restoring a backup)
+    global _data_revision
+    _data_revision += 1
+
+# Callbacks that push buffered writes to the database (see core/write_queue.py)
+_flush_hooks = []
+
+def register_flush_hook(hook):
+    _flush_hooks.append(hook)
+
+def flush_pending_writes():
+    # Called before reads that must see the latest edits, and on shutdown
+    for hook in list(_flush_hooks):
+        hook()
+
 def get_db():
     db = SessionLocal()
     try:
@@ -17,4 +78,6 @@ def get_db():
         db.close()
 
 def init_db():
-    Base.metadata.create_all(bind=engine)
+    from .migrations import run_migrations
+    from . import audit # Registers the operation log hook on SessionLocal
+    run_migrations(engine)
@@ -0,0 +1,90 @@
+from PySide6.QtCore import QThread, Signal
+from concurrent.futures import Future
+from .database import register_flush_hook
+import queue
+
+class DatabaseTask:
+    __slots__ = ("fn", "args", "kwargs", "future", "on_success", "on_error")
+
+    def __init__(self, fn, args, kwargs, on_success=None, on_error=None):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.future = Future()
+        self.on_success = on_success
+        self.on_error = on_error
+
+class DatabaseWorker(QThread):
+    # Runs database calls one at a time on a dedicated thread.
+    #
+    # submit() returns a concurrent.futures.Future right away. on_success /
+    # on_error callbacks are delivered back on the thread that owns the worker
+    # (the GUI thread), so they can touch widgets and models directly.
+    task_finished = Signal(object) # DatabaseTask
+    error = Signal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.tasks = queue.Queue()
+        # Called on the owning thread before each task is queued; buffered
+        # writes (core/write_queue.py) hand their batch over here, so it runs
+        # first and every task reads the latest edits
+        self.before_submit = []
+        # Emitted from the worker thread, so this is a queued connection
+        self.task_finished.connect(self.dispatch)
+
+    def run(self):
+        while True:
+            task = self.tasks.get()
+            if task is None:
+                break
+            if not task.future.set_running_or_notify_cancel():
+                continue
+            try:
+                task.future.set_result(task.fn(*task.args, **task.kwargs))
+            except Exception as e:
+                task.future.set_exception(e)
+            self.task_finished.emit(task)
+
+    def submit(self, fn, *args, on_success=None, on_error=None, **kwargs):
+        if not self.isRunning():
+            self.start()
+        if QThread.currentThread() == self.thread():
+            for hook in list(self.before_submit):
+                hook()
+        task = DatabaseTask(fn, args, kwargs, on_success, on_error)
+        self.tasks.put(task)
+        return task.future
+
+    def dispatch(self, task):
+        error = task.future.exception()
+        if error is None:
+            if task.on_success:
+                task.on_success(task.future.result())
+            return
+        print(f"Database task failed: {error}")
+        if task.on_error:
+            task.on_error(error)
+        self.error.emit(str(error))
+
+    def drain(self):
+        # Block until everything submitted so far has run. A no-op on the worker
+        # itself, where waiting on our own queue would deadlock.
+        if not self.isRunning() or QThread.currentThread() == self:
+            return
+        self.submit(lambda: None).result()
+
+    def stop(self):
+        if self.isRunning():
+            self.tasks.put(None)
+            self.wait()
+
+_worker = None
+
+def get_db_worker():
+    global _worker
+    if _worker is None:
+        _worker = DatabaseWorker()
+        # Reads that need the latest data also wait for in-flight writes
+        register_flush_hook(_worker.drain)
+    return _worker
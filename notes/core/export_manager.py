@@ -1,43 +1,331 @@
 import json
 import csv
-from .database import get_db
-from .models import Note, WorkLog
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter
-import pandas as pd
+import gzip
+import hashlib
+import re
+from concurrent.futures import ThreadPoolExecutor
+from .database import get_db, flush_pending_writes
+from .models import Note, WorkLog, OperationLog, Tag, note_tags, worklog_tags, STATUS_COMPLETED
+from .note_manager import batched
+from .pdf_report import build_report, report_styles, plain_text, paragraph_markup
+from sqlalchemy import String, func, select, type_coerce
+from reportlab.platypus import Paragraph
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+from openpyxl.styles import Font
+from datetime import datetime
 import os
 
+# Rows fetched per round trip while streaming exports
+EXPORT_BATCH_SIZE = 1000
+
+NDJSON_EXTENSIONS = (".ndjson", ".jsonl")
+
+# Notes laid out per PDF chunk; bounds the flowables alive at once
+PDF_CHUNK_SIZE = 200
+
+UNTAGGED = "无标签"
+
+EXCEL_CELL_LIMIT = 32767 # characters per cell
+
+# (header, column width)
+WORKLOG_COLUMNS = [("Date", 18), ("Title", 30), ("Content", 60), ("Duration", 10), ("Tags", 20)]
+
+def excel_text(value):
+    # Control characters are rejected by the xlsx format
+    if not value:
+        return value
+    return ILLEGAL_CHARACTERS_RE.sub("", value)[:EXCEL_CELL_LIMIT]
+
+# Markdown mirror: one file per note plus a manifest of what was written
+MANIFEST_NAME = ".manifest.json"
+MARKDOWN_WRITERS = 4
+FILENAME_UNSAFE_RE = re.compile(r'[\\/:*?"<>|\s]+')
+
+def markdown_filename(note_id, title):
+    # Id first so the name stays unique; the title part is only for humans
+    slug = FILENAME_UNSAFE_RE.sub("-", title or "").strip("-.")[:50]
+    return f"{note_id}-{slug}.md" if slug else f"{note_id}.md"
+
+def note_markdown(row):
+    # Only fields that make up the file; updated_at is tracked in the manifest
+    status = "completed" if row.status == STATUS_COMPLETED else "active"
+    header = f"---\nid: {row.id}\ncreated: {row.created_at}\nstatus: {status}\n---\n\n# {row.title or '无标题'}\n"
+    text = plain_text(row.content)
+    return f"{header}\n{text}\n" if text else header
+
+def write_file_atomic(path, text):
+    # Readers (grep, git) never see a half-written file
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8", newline="\n") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+def write_note_file(directory, filename, text, old_filename=None):
+    # A renamed note loses its old file first (on case-insensitive file systems
+    # the two names may be the same file)
+    if old_filename and old_filename != filename:
+        remove_file(os.path.join(directory, old_filename))
+    write_file_atomic(os.path.join(directory, filename), text)
+
+def remove_file(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+def load_manifest(directory):
+    try:
+        with open(os.path.join(directory, MANIFEST_NAME), "r", encoding="utf-8") as f:
+            return json.load(f).get("notes", {})
+    except (OSError, ValueError, AttributeError):
+        # Missing or unreadable: everything is exported again
+        return {}
+
+def open_export(filepath, compress=None):
+    # gzip when asked to, or when the file name ends in .gz
+    if compress is None:
+        compress = filepath.endswith(".gz")
+    if compress:
+        return gzip.open(filepath, "wt", encoding="utf-8")
+    return open(filepath, "w", encoding="utf-8")
+
+def export_format(filepath, fmt=None):
+    if fmt:
+        return fmt
+    name = filepath[:-3] if filepath.endswith(".gz") else filepath
+    return "ndjson" if name.endswith(NDJSON_EXTENSIONS) else "json"
+
+def note_record(row):
+    return {"id": row.id, "title": row.title, "content": row.content, "created_at": str(row.created_at)}
+
+def log_record(row):
+    return {"id": row.id, "action_type": row.action_type, "note_id": row.note_id,
+            "note_content": row.note_content, "created_at": str(row.created_at)}
+
 class ExportManager:
-    def export_notes_json(self, filepath):
+    def stream_rows(self, db, stmt, batch_size=EXPORT_BATCH_SIZE):
+        # Rows come off the cursor batch_size at a time; nothing is accumulated
+        return db.execute(stmt.execution_options(yield_per=batch_size))
+
+    def write_records(self, filepath, records, total=None, fmt=None, compress=None, progress=None):
+        # Writes records one at a time as a JSON array or NDJSON (one object per
+        # line). progress(done, total) is called after every batch.
+        fmt = export_format(filepath, fmt)
+        done = 0
+        with open_export(filepath, compress) as f:
+            if fmt == "json":
+                f.write("[")
+            for record in records:
+                line = json.dumps(record, ensure_ascii=False)
+                if fmt == "json":
+                    f.write(("\n    " if done == 0 else ",\n    ") + line)
+                else:
+                    f.write(line + "\n")
+                done += 1
+                if progress and done % EXPORT_BATCH_SIZE == 0:
+                    progress(done, total)
+            if fmt == "json":
+                f.write("\n]\n" if done else "]\n")
+        if progress:
+            progress(done, total)
+        return done
+
+    def export_notes_json(self, filepath, fmt=None, compress=None, progress=None):
+        # Streams notes to JSON / NDJSON (.ndjson, .jsonl), optionally gzipped (.gz).
+        # Returns the number of notes written.
+        flush_pending_writes()
         db = next(get_db())
-        notes = db.query(Note).filter(Note.is_deleted == False).all()
-        data = [{"id": n.id, "title": n.title, "content": n.content, "created_at": str(n.created_at)} for n in notes]
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=4)
-            
-    def export_notes_pdf(self, filepath):
+        try:
+            total = db.query(func.count(Note.id)).filter(Note.is_deleted == False).scalar()
+            rows = self.stream_rows(db, select(Note.id, Note.title, Note.content, Note.created_at)
+                                    .where(Note.is_deleted == False).order_by(Note.id))
+            return self.write_records(filepath, map(note_record, rows), total, fmt, compress, progress)
+        finally:
+            db.close()
+
+    def export_operation_logs_json(self, filepath, fmt=None, compress=None, progress=None):
+        # Same as export_notes_json for the operation log, oldest first
+        flush_pending_writes()
         db = next(get_db())
-        notes = db.query(Note).filter(Note.is_deleted == False).all()
-        c = canvas.Canvas(filepath, pagesize=letter)
-        y = 750
-        c.setFont("Helvetica", 12)
-        c.drawString(100, y, "Notes Export")
-        y -= 30
-        
-        for note in notes:
-            if y < 100:
-                c.showPage()
-                y = 750
-            c.drawString(100, y, f"Title: {note.title}")
-            y -= 20
-            c.drawString(100, y, f"Content: {note.content[:50]}...")
-            y -= 40
+        try:
+            total = db.query(func.count(OperationLog.id)).scalar()
+            # Entries of notes that still exist carry no title of their own
+            stmt = select(
+                OperationLog.id, OperationLog.action_type, OperationLog.note_id,
+                func.coalesce(OperationLog.note_content, Note.title).label("note_content"),
+                OperationLog.created_at,
+            ).outerjoin(Note, Note.id == OperationLog.note_id).order_by(OperationLog.id)
+            rows = self.stream_rows(db, stmt)
+            return self.write_records(filepath, map(log_record, rows), total, fmt, compress, progress)
+        finally:
+            db.close()
             
-        c.save()
+    def note_flowables(self, rows, styles, group_by, current_group):
+        # Flowables for one chunk of rows; a group heading wherever the group changes.
+        # Returns the flowables and the group the chunk ended in.
+        flowables = []
+        for row in rows:
+            if group_by is not None:
+                if group_by == "tag":
+                    group = row.tag or UNTAGGED
+                else:
+                    group = row.created_at.strftime("%Y-%m-%d") if row.created_at else "未知日期"
+                if group != current_group:
+                    flowables.append(Paragraph(paragraph_markup(group), styles["group"]))
+                    current_group = group
+            flowables.append(Paragraph(paragraph_markup(row.title or "无标题"), styles["heading"]))
+            if row.created_at:
+                flowables.append(Paragraph(row.created_at.strftime("%Y-%m-%d %H:%M"), styles["meta"]))
+            content = plain_text(row.content)
+            if content:
+                flowables.append(Paragraph(paragraph_markup(content), styles["body"]))
+        return flowables, current_group
+
+    def export_notes_pdf(self, filepath, group_by=None, progress=None):
+        # Notes, newest first, optionally grouped by "date" or "tag" (a note with
+        # several tags appears under each). Rows are read and laid out
+        # PDF_CHUNK_SIZE at a time. Returns the number of entries written.
+        flush_pending_writes()
+        db = next(get_db())
+        try:
+            columns = [Note.id, Note.title, Note.content, Note.created_at]
+            if group_by == "tag":
+                stmt = select(*columns, Tag.name.label("tag")) \
+                    .outerjoin(note_tags, note_tags.c.note_id == Note.id) \
+                    .outerjoin(Tag, Tag.id == note_tags.c.tag_id) \
+                    .order_by(Tag.name.is_(None), Tag.name, Note.created_at.desc(), Note.id.desc())
+            else:
+                stmt = select(*columns).order_by(Note.created_at.desc(), Note.id.desc())
+            stmt = stmt.where(Note.is_deleted == False)
+            total = db.execute(select(func.count()).select_from(stmt.subquery())).scalar()
+
+            styles = report_styles()
+            state = {"done": 0, "group": None}
 
-    def export_logs_excel(self, filepath):
+            def chunks():
+                yield [
+                    Paragraph("便签导出", styles["title"]),
+                    Paragraph(f"{datetime.now().strftime('%Y-%m-%d %H:%M')} · 共 {total} 条", styles["subtitle"]),
+                ]
+                for rows in self.stream_rows(db, stmt, PDF_CHUNK_SIZE).partitions():
+                    flowables, state["group"] = self.note_flowables(rows, styles, group_by, state["group"])
+                    yield flowables
+                    # Resumed once this chunk has been laid out
+                    state["done"] += len(rows)
+                    if progress:
+                        progress(state["done"], total)
+
+            build_report(filepath, "便签导出", chunks())
+            return state["done"]
+        finally:
+            db.close()
+
+    def export_logs_excel(self, filepath, start=None, end=None, progress=None):
+        # Work logs with start <= date < end (either bound optional), oldest first,
+        # written row by row with openpyxl's write-only mode. Returns the row count.
+        flush_pending_writes()
+        db = next(get_db())
+        try:
+            # Tags are gathered in the same statement (one index lookup per row)
+            tags = select(func.group_concat(Tag.name, ", ")) \
+                .join(worklog_tags, worklog_tags.c.tag_id == Tag.id) \
+                .where(worklog_tags.c.worklog_id == WorkLog.id) \
+                .scalar_subquery()
+            stmt = select(WorkLog.date, WorkLog.title, WorkLog.content, WorkLog.duration_minutes,
+                          tags.label("tags"))
+            if start is not None:
+                stmt = stmt.where(WorkLog.date >= start)
+            if end is not None:
+                stmt = stmt.where(WorkLog.date < end)
+            stmt = stmt.order_by(WorkLog.date, WorkLog.id)
+            total = db.execute(select(func.count()).select_from(stmt.subquery())).scalar()
+
+            workbook = Workbook(write_only=True)
+            sheet = workbook.create_sheet("Work Logs")
+            sheet.freeze_panes = "A2"
+            header_font = Font(bold=True)
+            header = []
+            for index, (name, width) in enumerate(WORKLOG_COLUMNS):
+                sheet.column_dimensions[chr(ord("A") + index)].width = width
+                cell = WriteOnlyCell(sheet, value=name)
+                cell.font = header_font
+                header.append(cell)
+            sheet.append(header)
+
+            done = 0
+            for row in self.stream_rows(db, stmt):
+                sheet.append((row.date, excel_text(row.title), excel_text(row.content),
+                              row.duration_minutes, excel_text(row.tags)))
+                done += 1
+                if progress and done % EXPORT_BATCH_SIZE == 0:
+                    progress(done, total)
+            workbook.save(filepath)
+            if progress:
+                progress(done, total)
+            return done
+        finally:
+            db.close()
+
+    def export_notes_markdown(self, directory, progress=None, max_workers=MARKDOWN_WRITERS):
+        # Mirrors notes into `directory`, one Markdown file per note. The manifest
+        # records each note's file, updated_at and content hash, so later runs only
+        # read and write notes whose updated_at moved (and skip the write when the
+        # rendered file is unchanged), and remove files of deleted notes.
+        # Delete the manifest to force a full export. Returns counts per outcome.
+        flush_pending_writes()
+        os.makedirs(directory, exist_ok=True)
+        manifest = load_manifest(directory)
         db = next(get_db())
-        logs = db.query(WorkLog).all()
-        data = [{"Date": l.date, "Title": l.title, "Content": l.content, "Duration": l.duration_minutes} for l in logs]
-        df = pd.DataFrame(data)
-        df.to_excel(filepath, index=False)
+        try:
+            # One narrow scan decides what to do; content is only read for changes.
+            # Stamps are compared as stored text, no datetime parsing.
+            stamps = {str(note_id): stamp for note_id, stamp in db.execute(
+                select(Note.id, type_coerce(func.coalesce(Note.updated_at, Note.created_at), String))
+                .where(Note.is_deleted == False)
+            )}
+            changed = [int(note_id) for note_id, stamp in stamps.items()
+                       if manifest.get(note_id, {}).get("updated_at") != stamp]
+            removed = [note_id for note_id in manifest if note_id not in stamps]
+            result = {"written": 0, "unchanged": 0, "removed": len(removed)}
+
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                futures = [pool.submit(remove_file, os.path.join(directory, manifest.pop(note_id)["file"]))
+                           for note_id in removed]
+                done = 0
+                for batch in batched(changed):
+                    rows = db.execute(
+                        select(Note.id, Note.title, Note.content, Note.created_at, Note.status)
+                        .where(Note.id.in_(batch))
+                    )
+                    for row in rows:
+                        note_id = str(row.id)
+                        text = note_markdown(row)
+                        digest = hashlib.sha1(text.encode("utf-8")).hexdigest()
+                        filename = markdown_filename(row.id, row.title)
+                        previous = manifest.get(note_id)
+                        if previous and previous["hash"] == digest and previous["file"] == filename:
+                            result["unchanged"] += 1
+                        else:
+                            futures.append(pool.submit(write_note_file, directory, filename, text,
+                                                       previous and previous["file"]))
+                            result["written"] += 1
+                        manifest[note_id] = {"file": filename, "updated_at": stamps[note_id], "hash": digest}
+                    # Finish a batch before reading the next, so pending texts stay bounded
+                    for future in futures:
+                        future.result()
+                    futures = []
+                    done += len(batch)
+                    if progress:
+                        progress(done, len(changed))
+                for future in futures:
+                    future.result()
+
+            # Written last: an interrupted run just redoes its work next time
+            if changed or removed:
+                write_file_atomic(os.path.join(directory, MANIFEST_NAME),
+                                  json.dumps({"version": 1, "notes": manifest}, ensure_ascii=False))
+            return result
+        finally:
+            db.close()
@@ -0,0 +1,275 @@
+import csv
+import gzip
+import hashlib
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import islice
+from sqlalchemy import select
+from openpyxl import load_workbook
+from .database import get_db, flush_pending_writes
+from .models import (Note, WorkLog, Tag, worklog_tags, STATUS_ACTIVE, STATUS_COMPLETED,
+                     PRIORITY_NORMAL, COLOR_DEFAULT, COLOR_COMPLETED)
+from .audit import log_row, write_logs
+from . import daily_stats
+from .import_parsers import (KIND_NOTES, KIND_WORKLOGS, ITEM_LINES, ITEM_RECORDS, ITEM_MARKDOWN,
+                             parse_chunk, record_hash, local_time)
+from app.constants import DATA_DIR
+
+# Bulk import of notes and work logs from JSON, NDJSON, CSV, Excel or a folder of
+# Markdown files.
+#
+# The source is read in chunks (in source order). Chunks are parsed and hashed in
+# a process pool, records whose content hash is already stored (or appeared
+# earlier in the import) are skipped, and each chunk is inserted in one
+# transaction with its operation log / daily_stats rows. After every committed
+# chunk a checkpoint records how far into the source we got, so an interrupted
+# import resumes there; a chunk committed just before a crash is caught by the
+# de-duplication on the next run.
+
+IMPORT_CHUNK_SIZE = 2000
+IMPORT_WORKERS = 4
+CHECKPOINT_DIR = os.path.join(DATA_DIR, "imports")
+
+# Core inserts: the ORM bulk path adds per-row bookkeeping we don't need
+note_table = Note.__table__
+worklog_table = WorkLog.__table__
+tag_table = Tag.__table__
+
+def source_format(source):
+    if os.path.isdir(source):
+        return "markdown"
+    name = source[:-3] if source.endswith(".gz") else source
+    extension = os.path.splitext(name)[1].lower()
+    formats = {".ndjson": "ndjson", ".jsonl": "ndjson", ".json": "json", ".csv": "csv", ".xlsx": "excel"}
+    if extension not in formats:
+        raise ValueError(f"Unsupported import source: {source}")
+    return formats[extension]
+
+def open_source(source):
+    if source.endswith(".gz"):
+        return gzip.open(source, "rt", encoding="utf-8-sig")
+    return open(source, "r", encoding="utf-8-sig", newline="")
+
+def chunked(items, size):
+    items = iter(items)
+    while True:
+        chunk = list(islice(items, size))
+        if not chunk:
+            return
+        yield chunk
+
+class ImportManager:
+    def __init__(self, workers=None, chunk_size=IMPORT_CHUNK_SIZE):
+        self.workers = workers if workers is not None else min(IMPORT_WORKERS, os.cpu_count() or 1)
+        self.chunk_size = chunk_size
+
+    def import_notes(self, source, fmt=None, progress=None, resume=True):
+        return self.run(KIND_NOTES, source, fmt, progress, resume)
+
+    def import_worklogs(self, source, fmt=None, progress=None, resume=True):
+        return self.run(KIND_WORKLOGS, source, fmt, progress, resume)
+
+    # --- Source reading ---
+
+    def read_items(self, source, fmt):
+        # -> (item format, iterable of raw items in source order, total or None)
+        if fmt == "ndjson":
+            return ITEM_LINES, self.read_lines(source), None
+        if fmt == "json":
+            with open_source(source) as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                # {"notes": [...]} style wrappers
+                data = next((value for value in data.values() if isinstance(value, list)), [])
+            return ITEM_RECORDS, data, len(data)
+        if fmt == "csv":
+            return ITEM_RECORDS, self.read_csv(source), None
+        if fmt == "excel":
+            return ITEM_RECORDS, self.read_excel(source), None
+        if fmt == "markdown":
+            paths = []
+            for root, dirs, files in os.walk(source):
+                dirs.sort()
+                paths += [os.path.join(root, name) for name in sorted(files) if name.endswith(".md")]
+            return ITEM_MARKDOWN, paths, len(paths)
+        raise ValueError(f"Unsupported import format: {fmt}")
+
+    def read_lines(self, source):
+        with open_source(source) as f:
+            yield from f
+
+    def read_csv(self, source):
+        with open_source(source) as f:
+            yield from csv.DictReader(f)
+
+    def read_excel(self, source):
+        workbook = load_workbook(source, read_only=True, data_only=True)
+        try:
+            rows = workbook.worksheets[0].iter_rows(values_only=True)
+            header = [str(name) if name is not None else "" for name in next(rows, [])]
+            for row in rows:
+                if any(value is not None for value in row):
+                    yield dict(zip(header, row))
+        finally:
+            workbook.close()
+
+    def parse_chunks(self, kind, item_format, chunks):
+        # Parsed chunks in source order. At most two chunks per worker are in
+        # flight, so a large source is never read into memory ahead of the inserts.
+        if self.workers <= 1:
+            for chunk in chunks:
+                yield len(chunk), parse_chunk(kind, item_format, chunk)
+            return
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            pending = deque()
+            for chunk in chunks:
+                pending.append((len(chunk), pool.submit(parse_chunk, kind, item_format, chunk)))
+                if len(pending) >= self.workers * 2:
+                    size, future = pending.popleft()
+                    yield size, future.result()
+            while pending:
+                size, future = pending.popleft()
+                yield size, future.result()
+
+    # --- Checkpoints ---
+
+    def checkpoint_path(self, kind, source):
+        key = hashlib.sha1(f"{kind}:{os.path.abspath(source)}".encode("utf-8")).hexdigest()
+        return os.path.join(CHECKPOINT_DIR, f"{key}.json")
+
+    def source_signature(self, source):
+        # A changed source starts over instead of resuming at a stale offset
+        if os.path.isdir(source):
+            return None
+        stat = os.stat(source)
+        return [stat.st_size, int(stat.st_mtime)]
+
+    def load_checkpoint(self, path, signature):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                checkpoint = json.load(f)
+        except (OSError, ValueError):
+            return 0
+        return checkpoint.get("done", 0) if checkpoint.get("signature") == signature else 0
+
+    def save_checkpoint(self, path, source, signature, done):
+        os.makedirs(CHECKPOINT_DIR, exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"source": os.path.abspath(source), "signature": signature, "done": done}, f)
+        os.replace(tmp_path, path)
+
+    # --- Inserts ---
+
+    def existing_hashes(self, db, kind):
+        if kind == KIND_NOTES:
+            rows = db.execute(select(Note.title, Note.content).where(Note.is_deleted == False))
+            return {record_hash(kind, {"title": title or "", "content": content or ""})
+                    for title, content in rows}
+        rows = db.execute(select(WorkLog.date, WorkLog.title, WorkLog.content, WorkLog.duration_minutes)
+                          .where(WorkLog.date.isnot(None)))
+        return {record_hash(kind, {"date": log_date, "title": title or "", "content": content or "",
+                                   "duration_minutes": minutes or 0})
+                for log_date, title, content, minutes in rows}
+
+    def insert_notes(self, db, records):
+        # UTC, like the column's func.now() default
+        now = datetime.utcnow()
+        rows = []
+        for record in records:
+            completed = record["completed"]
+            rows.append({
+                "title": record["title"], "content": record["content"],
+                "color": COLOR_COMPLETED if completed else COLOR_DEFAULT,
+                "status": STATUS_COMPLETED if completed else STATUS_ACTIVE,
+                "priority": PRIORITY_NORMAL, "is_deleted": False,
+                "created_at": record["created_at"] or now,
+            })
+        # Unordered RETURNING lets SQLAlchemy batch the rows into multi-row
+        # INSERTs; the log rows only need each id with its date
+        created = db.execute(note_table.insert().returning(note_table.c.id, note_table.c.created_at), rows).all()
+        # Creation is logged on the note's own date so history and daily_stats line
+        # up; the log is in local time, note timestamps are UTC
+        write_logs(db, [log_row("create", note_id, created_at=local_time(created_at))
+                        for note_id, created_at in created])
+
+    def insert_worklogs(self, db, records, tag_ids):
+        # created_at is left to the column's func.now() default, as for work logs
+        # added any other way
+        rows = [{"date": record["date"], "title": record["title"], "content": record["content"],
+                 "duration_minutes": record["duration_minutes"]}
+                for record in records]
+        # Ids come back in parameter order, so they line up with records
+        created = db.execute(worklog_table.insert().returning(
+            worklog_table.c.id, sort_by_parameter_order=True), rows)
+        log_tags = [(log_id, record["tags"]) for (log_id,), record in zip(created, records)]
+
+        new_tags = sorted({tag for record in records for tag in record["tags"]} - set(tag_ids))
+        if new_tags:
+            created_tags = db.execute(tag_table.insert().returning(tag_table.c.id, tag_table.c.name),
+                                      [{"name": name} for name in new_tags])
+            tag_ids.update({name: tag_id for tag_id, name in created_tags})
+        links = [{"worklog_id": log_id, "tag_id": tag_ids[tag]} for log_id, tags in log_tags for tag in tags]
+        if links:
+            db.execute(worklog_tags.insert(), links)
+
+        # Set-based inserts skip the WorkLog flush hook; count the minutes here
+        deltas = {}
+        for record in records:
+            key = (daily_stats.work_day_key(record["date"]), "work_minutes")
+            deltas[key] = deltas.get(key, 0) + record["duration_minutes"]
+        daily_stats.bump(db, deltas)
+
+    # --- Driver ---
+
+    def run(self, kind, source, fmt=None, progress=None, resume=True):
+        # Returns {"imported", "duplicates", "invalid", "resumed_from"}.
+        # progress(done, total) counts source items; total may be None (streams).
+        fmt = fmt or source_format(source)
+        checkpoint = self.checkpoint_path(kind, source)
+        signature = self.source_signature(source)
+        skip = self.load_checkpoint(checkpoint, signature) if resume else 0
+        item_format, items, total = self.read_items(source, fmt)
+        result = {"imported": 0, "duplicates": 0, "invalid": 0, "resumed_from": skip}
+
+        flush_pending_writes()
+        db = next(get_db())
+        try:
+            seen = self.existing_hashes(db, kind)
+            tag_ids = dict(db.execute(select(Tag.name, Tag.id)).all()) if kind == KIND_WORKLOGS else None
+            done = skip
+            chunks = chunked(islice(items, skip, None), self.chunk_size)
+            for size, (records, invalid) in self.parse_chunks(kind, item_format, chunks):
+                fresh = []
+                for record in records:
+                    if record["hash"] in seen:
+                        result["duplicates"] += 1
+                    else:
+                        seen.add(record["hash"])
+                        fresh.append(record)
+                if fresh:
+                    try:
+                        if kind == KIND_NOTES:
+                            self.insert_notes(db, fresh)
+                        else:
+                            self.insert_worklogs(db, fresh, tag_ids)
+                        db.commit()
+                    except Exception:
+                        db.rollback()
+                        raise
+                result["imported"] += len(fresh)
+                result["invalid"] += invalid
+                done += size
+                self.save_checkpoint(checkpoint, source, signature, done)
+                if progress:
+                    progress(done, total)
+        finally:
+            db.close()
+
+        # Finished: the next import of this source starts from the top
+        if os.path.exists(checkpoint):
+            os.remove(checkpoint)
+        return result
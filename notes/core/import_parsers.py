@@ -0,0 +1,165 @@
+import hashlib
+import json
+import os
+import re
+from datetime import datetime, date, timezone
+
+# Parsing and normalization for core/import_manager.py. parse_chunk runs in
+# worker processes, so this module only uses the standard library (importing it
+# must not open the database or load Qt).
+
+KIND_NOTES = "notes"
+KIND_WORKLOGS = "worklogs"
+
+# Raw item formats handed to parse_chunk
+ITEM_LINES = "lines" # NDJSON text lines
+ITEM_RECORDS = "records" # dicts (JSON array, CSV, Excel rows)
+ITEM_MARKDOWN = "markdown" # Markdown file paths
+
+# Source field names (lower case) -> record field; covers our own exports
+NOTE_FIELDS = {
+    "title": "title", "标题": "title",
+    "content": "content", "内容": "content",
+    "created_at": "created_at", "created": "created_at", "date": "created_at",
+    "status": "status",
+}
+WORKLOG_FIELDS = {
+    "date": "date", "日期": "date",
+    "title": "title", "标题": "title",
+    "content": "content", "内容": "content",
+    "duration": "duration_minutes", "duration_minutes": "duration_minutes", "时长": "duration_minutes",
+    "tags": "tags", "标签": "tags",
+}
+
+COMPLETED_VALUES = {"1", "completed", "complete", "done", "true", "已完成"}
+
+FRONT_MATTER_RE = re.compile(r"\A---\n(.*?)\n---\n?", re.S)
+FILENAME_ID_RE = re.compile(r"^\d+-")
+
+def parse_time(value):
+    # Naive UTC, as stored (func.now() / utcnow defaults). Values with a UTC
+    # offset are converted; naive values are taken as they are.
+    if value is None or value == "":
+        return None
+    if isinstance(value, date) and not isinstance(value, datetime):
+        return datetime(value.year, value.month, value.day)
+    if not isinstance(value, datetime):
+        text = str(value).strip().replace("T", " ")
+        if text.endswith("Z"):
+            text = text[:-1] + "+00:00"
+        try:
+            value = datetime.fromisoformat(text)
+        except ValueError:
+            return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+def local_time(value):
+    # Naive UTC (as parse_time returns) -> naive local time, which the
+    # operation log and its day keys use
+    return value.replace(tzinfo=timezone.utc).astimezone().replace(tzinfo=None)
+
+def text_value(value):
+    if value is None:
+        return ""
+    return value if isinstance(value, str) else str(value)
+
+def record_hash(kind, record):
+    # Identity used for de-duplication; also computed for rows already stored
+    if kind == KIND_NOTES:
+        key = [record["title"], record["content"]]
+    else:
+        key = [record["date"].isoformat(sep=" "), record["title"], record["content"],
+               record["duration_minutes"]]
+    return hashlib.sha1(json.dumps(key, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+def map_fields(raw, fields):
+    mapped = {}
+    for key, value in raw.items():
+        field = fields.get(str(key).strip().lower())
+        if field and field not in mapped:
+            mapped[field] = value
+    return mapped
+
+def normalize(kind, raw):
+    # Returns the record (with its hash) or None when it can't be imported
+    if not isinstance(raw, dict):
+        return None
+    if kind == KIND_NOTES:
+        fields = map_fields(raw, NOTE_FIELDS)
+        title = text_value(fields.get("title")).strip()
+        content = text_value(fields.get("content"))
+        if not title and not content.strip():
+            return None
+        record = {
+            "title": title or content.strip().splitlines()[0][:50],
+            "content": content,
+            "created_at": parse_time(fields.get("created_at")),
+            "completed": text_value(fields.get("status")).strip().lower() in COMPLETED_VALUES,
+        }
+    else:
+        fields = map_fields(raw, WORKLOG_FIELDS)
+        log_date = parse_time(fields.get("date"))
+        if log_date is None:
+            return None
+        try:
+            minutes = int(float(fields.get("duration_minutes") or 0))
+        except (TypeError, ValueError):
+            return None
+        tags = fields.get("tags") or []
+        if isinstance(tags, str):
+            tags = tags.split(",")
+        record = {
+            "date": log_date,
+            "title": text_value(fields.get("title")).strip(),
+            "content": text_value(fields.get("content")),
+            "duration_minutes": minutes,
+            "tags": sorted({text_value(tag).strip() for tag in tags if text_value(tag).strip()}),
+        }
+    record["hash"] = record_hash(kind, record)
+    return record
+
+def markdown_record(path):
+    # Front matter (as written by ExportManager.export_notes_markdown) is
+    # optional; the first "# " heading is the title, the rest the content
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read().replace("\r\n", "\n")
+    raw = {}
+    match = FRONT_MATTER_RE.match(text)
+    if match:
+        for line in match.group(1).splitlines():
+            key, _, value = line.partition(":")
+            raw[key.strip()] = value.strip()
+        text = text[match.end():]
+    lines = text.lstrip("\n").split("\n")
+    if lines and lines[0].startswith("# "):
+        raw["title"] = lines[0][2:].strip()
+        lines = lines[1:]
+    else:
+        raw["title"] = FILENAME_ID_RE.sub("", os.path.splitext(os.path.basename(path))[0])
+    raw["content"] = "\n".join(lines).strip("\n")
+    return raw
+
+def parse_chunk(kind, item_format, items):
+    # -> (records, invalid count); records keep source order
+    records = []
+    invalid = 0
+    for item in items:
+        try:
+            if item_format == ITEM_LINES:
+                if not item.strip():
+                    continue
+                raw = json.loads(item)
+            elif item_format == ITEM_MARKDOWN:
+                raw = markdown_record(item)
+            else:
+                raw = item
+            record = normalize(kind, raw)
+        except (ValueError, OSError, UnicodeDecodeError):
+            record = None
+        if record is None:
+            invalid += 1
+        else:
+            records.append(record)
+    return records, invalid
@@ -0,0 +1,158 @@
+import time
+from sqlalchemy.exc import OperationalError
+from .database import Base, engine
+from . import models  # noqa: F401  (registers tables on Base.metadata)
+
+# Schema migrations.
+#
+# Each step is (version, description, function(conn)). Steps run in order inside a
+# single transaction. Fresh databases get the full current schema from step 1, so
+# every later step must be idempotent (check before ALTER, IF NOT EXISTS, ...).
+
+def _column_names(conn, table):
+    return [row[1] for row in conn.exec_driver_sql(f"PRAGMA table_info({table})")]
+
+def _create_base_schema(conn):
+    Base.metadata.create_all(bind=conn)
+
+def _add_note_status(conn):
+    # Older databases predate notes.status; add it and derive status/priority from color
+    if "status" not in _column_names(conn, "notes"):
+        conn.exec_driver_sql("ALTER TABLE notes ADD COLUMN status INTEGER DEFAULT 0")
+        conn.exec_driver_sql("UPDATE notes SET status = CASE WHEN color = '#e0e0e0' THEN 1 ELSE 0 END")
+        conn.exec_driver_sql("UPDATE notes SET priority = CASE WHEN color = '#ffcccc' THEN 1 ELSE 0 END")
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_notes_display_order "
+        "ON notes (is_deleted, status, priority DESC, created_at DESC)"
+    )
+
+def _create_fts_table(conn, name, columns, content_table):
+    # trigram handles Chinese text (no word boundaries); fall back where it's unavailable
+    column_list = ", ".join(columns)
+    for tokenizer in ("trigram", "unicode61"):
+        try:
+            conn.exec_driver_sql(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {name} USING fts5({column_list}, "
+                f"content='{content_table}', content_rowid='id', tokenize='{tokenizer}')"
+            )
+            return
+        except OperationalError:
+            if tokenizer == "unicode61":
+                raise
+
+def _add_fts_triggers(conn, name, columns, content_table):
+    column_list = ", ".join(columns)
+    new_values = ", ".join(f"new.{column}" for column in columns)
+    old_values = ", ".join(f"old.{column}" for column in columns)
+    conn.exec_driver_sql(
+        f"CREATE TRIGGER IF NOT EXISTS {name}_ai AFTER INSERT ON {content_table} BEGIN "
+        f"INSERT INTO {name}(rowid, {column_list}) VALUES (new.id, {new_values}); END"
+    )
+    conn.exec_driver_sql(
+        f"CREATE TRIGGER IF NOT EXISTS {name}_ad AFTER DELETE ON {content_table} BEGIN "
+        f"INSERT INTO {name}({name}, rowid, {column_list}) VALUES ('delete', old.id, {old_values}); END"
+    )
+    conn.exec_driver_sql(
+        f"CREATE TRIGGER IF NOT EXISTS {name}_au AFTER UPDATE OF {column_list} ON {content_table} BEGIN "
+        f"INSERT INTO {name}({name}, rowid, {column_list}) VALUES ('delete', old.id, {old_values}); "
+        f"INSERT INTO {name}(rowid, {column_list}) VALUES (new.id, {new_values}); END"
+    )
+
+def _add_full_text_search(conn):
+    # External-content FTS5 indexes kept in sync by triggers, then filled from existing rows
+    for name, columns, content_table in (("notes_fts", ("title", "content"), "notes"),
+                                         ("logs_fts", ("note_content",), "operation_logs")):
+        _create_fts_table(conn, name, columns, content_table)
+        _add_fts_triggers(conn, name, columns, content_table)
+        conn.exec_driver_sql(f"INSERT INTO {name}({name}) VALUES ('rebuild')")
+
+def _normalize_operation_logs(conn):
+    # Logs reference their note by id; titles are only copied once a note is deleted.
+    # Existing rows keep their copied titles. Also adds the retention rollup table.
+    if "note_id" not in _column_names(conn, "operation_logs"):
+        conn.exec_driver_sql("ALTER TABLE operation_logs ADD COLUMN note_id INTEGER")
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_operation_logs_note_id ON operation_logs (note_id)"
+    )
+    models.OperationLogDaily.__table__.create(bind=conn, checkfirst=True)
+
+def _add_log_time_indexes(conn):
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_operation_logs_created_at ON operation_logs (created_at)"
+    )
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_operation_logs_action_created "
+        "ON operation_logs (action_type, created_at)"
+    )
+
+def _add_daily_stats(conn):
+    # Create the table and fill it from existing worklogs and operation logs
+    from .daily_stats import rebuild
+    from sqlalchemy.orm import Session
+    models.DailyStats.__table__.create(bind=conn, checkfirst=True)
+    with Session(bind=conn) as db:
+        rebuild(db)
+
+def _add_worklog_indexes(conn):
+    conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_worklogs_date ON worklogs (date)")
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_worklog_tags_worklog_id ON worklog_tags (worklog_id)"
+    )
+
+def _rekey_work_minutes(conn):
+    # Work minutes were counted on the UTC day of WorkLog.date; recount them on
+    # the local day, like the note counts
+    from .daily_stats import rebuild
+    from sqlalchemy.orm import Session
+    with Session(bind=conn) as db:
+        rebuild(db)
+
+MIGRATIONS = [
+    (1, "initial schema", _create_base_schema),
+    (2, "note status/priority columns and display order index", _add_note_status),
+    (3, "full-text search over notes and operation logs", _add_full_text_search),
+    (4, "operation log note references and daily rollup table", _normalize_operation_logs),
+    (5, "operation log time-range indexes", _add_log_time_indexes),
+    (6, "daily activity totals", _add_daily_stats),
+    (7, "worklog date and tag lookup indexes", _add_worklog_indexes),
+    (8, "daily work minutes on local days", _rekey_work_minutes),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+def get_schema_version(conn):
+    try:
+        row = conn.exec_driver_sql("SELECT version FROM schema_version").first()
+    except OperationalError:
+        # No schema_version table yet
+        return 0
+    return row[0] if row else 0
+
+def _set_schema_version(conn, version):
+    conn.exec_driver_sql("DELETE FROM schema_version")
+    conn.exec_driver_sql("INSERT INTO schema_version (version) VALUES (?)", (version,))
+
+def run_migrations(bind=engine):
+    # Fast path: a single SELECT, no reflection, when the database is up to date
+    with bind.connect() as conn:
+        if get_schema_version(conn) == SCHEMA_VERSION:
+            return []
+
+    start = time.perf_counter()
+    applied = []
+    with bind.begin() as conn:
+        conn.exec_driver_sql("CREATE TABLE IF NOT EXISTS schema_version (version INTEGER NOT NULL)")
+        current = get_schema_version(conn)
+        for version, description, step in MIGRATIONS:
+            if version <= current:
+                continue
+            step_start = time.perf_counter()
+            step(conn)
+            applied.append(version)
+            print(f"Migration {version} ({description}) applied in "
+                  f"{(time.perf_counter() - step_start) * 1000:.1f} ms")
+        _set_schema_version(conn, SCHEMA_VERSION)
+
+    print(f"Database schema migrated from v{current} to v{SCHEMA_VERSION} in "
+          f"{(time.perf_counter() - start) * 1000:.1f} ms")
+    return applied
@@ -1,9 +1,27 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Table
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Table, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from .database import Base
 import datetime
 
+# Note status / priority values
+STATUS_ACTIVE = 0
+STATUS_COMPLETED = 1
+
+PRIORITY_NORMAL = 0
+PRIORITY_HIGH = 1
+
+# Legacy color encoding, still used for card styling
+COLOR_DEFAULT = "#ffffff"
+COLOR_COMPLETED = "#e0e0e0"
+COLOR_URGENT = "#ffcccc"
+
+def status_from_color(color):
+    return STATUS_COMPLETED if color == COLOR_COMPLETED else STATUS_ACTIVE
+
+def priority_from_color(color):
+    return PRIORITY_HIGH if color == COLOR_URGENT else PRIORITY_NORMAL
+
 # Association tables
 note_tags = Table('note_tags', Base.metadata,
     Column('note_id', Integer, ForeignKey('notes.id')),
@@ -12,7 +30,8 @@ note_tags = Table('note_tags', Base.metadata,
 
 worklog_tags = Table('worklog_tags', Base.metadata,
     Column('worklog_id', Integer, ForeignKey('worklogs.id')),
-    Column('tag_id', Integer, ForeignKey('tags.id'))
+    Column('tag_id', Integer, ForeignKey('tags.id')),
+    Index('ix_worklog_tags_worklog_id', 'worklog_id'),
 )
 
 class Tag(Base):
@@ -32,10 +51,24 @@ class Note(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     color = Column(String, default="#FFF9E6")
     is_deleted = Column(Boolean, default=False) # For trash bin
-    priority = Column(Integer, default=0) # 0: Normal, 1: High
+    priority = Column(Integer, default=PRIORITY_NORMAL) # 0: Normal, 1: High
+    status = Column(Integer, default=STATUS_ACTIVE) # 0: Active, 1: Completed
 
     tags = relationship("Tag", secondary=note_tags, backref="notes")
 
+    # Matches the list display order so SQLite can walk the index instead of sorting
+    __table_args__ = (
+        Index('ix_notes_display_order', 'is_deleted', 'status', priority.desc(), created_at.desc()),
+    )
+
+    @property
+    def is_completed(self):
+        return self.status == STATUS_COMPLETED
+
+    @property
+    def is_urgent(self):
+        return self.priority == PRIORITY_HIGH and not self.is_completed
+
 class WorkLog(Base):
     __tablename__ = 'worklogs'
 
@@ -49,10 +82,40 @@ class WorkLog(Base):
 
     tags = relationship("Tag", secondary=worklog_tags, backref="worklogs")
 
+    # Date-range reads (exports) walk this in order
+    __table_args__ = (
+        Index('ix_worklogs_date', date),
+    )
+
 class OperationLog(Base):
     __tablename__ = 'operation_logs'
 
     id = Column(Integer, primary_key=True, index=True)
     action_type = Column(String) # "create", "complete", "delete", "restore"
-    note_content = Column(String)
+    note_id = Column(Integer, index=True) # No FK: notes are hard deleted, the log outlives them
+    note_content = Column(String) # Title snapshot, only stored once the note is gone
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Time-range reads (log view, per-day counts) walk these instead of scanning
+    __table_args__ = (
+        Index('ix_operation_logs_created_at', created_at),
+        Index('ix_operation_logs_action_created', action_type, created_at),
+    )
+
+class DailyStats(Base):
+    # Per-day activity totals, maintained incrementally (see core/daily_stats.py)
+    __tablename__ = 'daily_stats'
+
+    day = Column(String, primary_key=True) # "YYYY-MM-DD", local time
+    work_minutes = Column(Integer, nullable=False, default=0)
+    notes_created = Column(Integer, nullable=False, default=0)
+    notes_completed = Column(Integer, nullable=False, default=0)
+    notes_deleted = Column(Integer, nullable=False, default=0)
+
+class OperationLogDaily(Base):
+    # Per-day counts of operation logs that aged out of the retention window
+    __tablename__ = 'operation_log_daily'
+
+    day = Column(String, primary_key=True) # "YYYY-MM-DD", local time
+    action_type = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
@@ -1,39 +1,220 @@
-from .database import get_db
-from .models import Note, OperationLog
+from .database import get_db, flush_pending_writes
+from .audit import EMPTY_TITLE, record_many, forget_notes
+from .models import (Note, OperationLog, OperationLogDaily, STATUS_ACTIVE, STATUS_COMPLETED, PRIORITY_NORMAL,
+                     PRIORITY_HIGH, COLOR_DEFAULT, COLOR_COMPLETED, COLOR_URGENT,
+                     status_from_color, priority_from_color)
+from sqlalchemy import DateTime, String, and_, delete, func, insert, or_, text, type_coerce, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
-from datetime import datetime
+from datetime import date, datetime, timedelta
+from app.config import app_config
+
+DEFAULT_PAGE_SIZE = 200
+
+# Ids per IN (...) list in bulk statements, well under SQLite's variable limit
+BULK_BATCH_SIZE = 500
+
+def batched(items, size=BULK_BATCH_SIZE):
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+# Display order of the note list; ix_notes_display_order covers it (id is the rowid)
+NOTE_ORDER = (
+    (Note.status, False),
+    (Note.priority, True),
+    (Note.created_at, True),
+    (Note.id, True),
+)
+
+LOG_ORDER = (
+    (OperationLog.created_at, True),
+    (OperationLog.id, True),
+)
+
+# Highlight markers around matched text in search snippets
+SNIPPET_START = "["
+SNIPPET_END = "]"
+
+def fts_terms(query):
+    return [term for term in query.split() if term]
+
+def fts_match_expression(terms, prefix=False):
+    # Quote every term so user input can't inject FTS5 syntax; terms are ANDed
+    quoted = ['"' + term.replace('"', '""') + '"' + ("*" if prefix else "") for term in terms]
+    return " ".join(quoted)
+
+def like_pattern(term):
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+def raw_column(column):
+    # Datetimes are stored as text in two formats (server default vs. Python-side
+    # values with microseconds), so cursors keep and compare the stored text as-is
+    if isinstance(column.type, DateTime):
+        return type_coerce(column, String)
+    return column
+
+def keyset_after(order, cursor):
+    # Rows strictly after `cursor` in `order`, expanded per column since the
+    # directions are mixed and SQLite row values only compare one way
+    condition = None
+    for (column, descending), value in reversed(list(zip(order, cursor))):
+        column = raw_column(column)
+        past = column < value if descending else column > value
+        condition = past if condition is None else or_(past, and_(column == value, condition))
+    return condition
+
+def order_clauses(order):
+    return [column.desc() if descending else column.asc() for column, descending in order]
+
+def fetch_page(db, query, order, cursor, page_size):
+    # One keyset page plus the cursor of its last row (None when exhausted)
+    if cursor is not None:
+        query = query.filter(keyset_after(order, cursor))
+    rows = query.add_columns(*[raw_column(column) for column, _ in order]) \
+        .order_by(*order_clauses(order)).limit(page_size).all()
+    db.expunge_all()
+    page = [row[0] for row in rows]
+    next_cursor = tuple(rows[-1][1:]) if len(rows) == page_size else None
+    return page, next_cursor
 
 class NoteManager:
     def get_all_notes(self):
+        flush_pending_writes()
         db = next(get_db())
         try:
-            # Sort by color (completed #e0e0e0 should be last) and then by created_at DESC
-            # Since we can't easily sort by color value in SQL portably/cleanly for "completed last",
-            # we will fetch all and sort in Python or do two queries.
-            # Python sorting is easier for custom logic.
-            notes = db.query(Note).filter(Note.is_deleted == False).all()
-            
-            # Detach first
-            for note in notes:
-                db.expunge(note)
-                
-            # Sort logic:
-            # 1. Uncompleted first (color != #e0e0e0)
-            # 2. Within each group, Created At DESC (Newest first)
-            
-            def sort_key(n):
-                is_completed = (n.color == "#e0e0e0")
-                # Tuple comparison: False (0) comes before True (1)
-                # Timestamp: negate timestamp for descending order (or reverse whole list)
-                return (is_completed, -n.created_at.timestamp())
+            # Uncompleted first, urgent on top, then newest first.
+            # Served straight from ix_notes_display_order, no Python-side sort.
+            notes = db.query(Note).filter(Note.is_deleted == False).order_by(
+                *order_clauses(NOTE_ORDER)
+            ).all()
+
+            # Detach so the notes can be used after the session closes
+            db.expunge_all()
+            return notes
+        finally:
+            db.close()
+
+    def iter_note_pages(self, page_size=DEFAULT_PAGE_SIZE, after=None):
+        # Yields (notes, cursor) in display order, one short-lived session per page.
+        # Pass a cursor back as `after` to resume; it is None on the last page.
+        flush_pending_writes()
+        cursor = after
+        while True:
+            db = next(get_db())
+            try:
+                query = db.query(Note).filter(Note.is_deleted == False)
+                page, cursor = fetch_page(db, query, NOTE_ORDER, cursor, page_size)
+            finally:
+                db.close()
+            yield page, cursor
+            if cursor is None:
+                return
+
+    def iter_notes(self, page_size=DEFAULT_PAGE_SIZE, after=None):
+        # Pages are fetched lazily as the consumer advances
+        for page, _ in self.iter_note_pages(page_size, after):
+            yield from page
+
+    def iter_log_pages(self, page_size=DEFAULT_PAGE_SIZE, after=None, since=None):
+        # Same as iter_note_pages for the operation log, newest first.
+        # `since` stops the stream at entries older than the given datetime.
+        flush_pending_writes()
+        cursor = after
+        while True:
+            db = next(get_db())
+            try:
+                query = db.query(OperationLog)
+                if since is not None:
+                    query = query.filter(OperationLog.created_at >= since)
+                page, cursor = fetch_page(db, query, LOG_ORDER, cursor, page_size)
+                self.resolve_log_titles(db, page)
+            finally:
+                db.close()
+            yield page, cursor
+            if cursor is None:
+                return
+
+    def iter_logs(self, page_size=DEFAULT_PAGE_SIZE, after=None, since=None):
+        for page, _ in self.iter_log_pages(page_size, after, since):
+            yield from page
+
+    def search(self, query, limit=50):
+        # Full-text search over notes and operation logs (FTS5, BM25 ranking).
+        # Log entries only carry a title once their note is deleted (core/audit.py),
+        # so logs_fts finds deleted notes' history; live notes come from notes_fts.
+        # Returns dicts: kind ("note"/"log"), id, title, snippet, rank (lower is better).
+        terms = fts_terms(query)
+        if not terms:
+            return []
+        flush_pending_writes()
+        db = next(get_db())
+        try:
+            trigram = self._fts_uses_trigram(db)
+            if trigram and min(len(term) for term in terms) < 3:
+                # trigram can't index 1-2 character terms (common in Chinese); scan instead
+                return self._search_like(db, terms, limit)
             
-            notes.sort(key=sort_key)
+            match = fts_match_expression(terms, prefix=not trigram)
+            params = {"match": match, "limit": limit, "start": SNIPPET_START, "end": SNIPPET_END}
+            note_rows = db.execute(text(
+                "SELECT n.id, n.title, "
+                "snippet(notes_fts, -1, :start, :end, '…', 12), "
+                "bm25(notes_fts, 10.0, 1.0) AS rank "
+                "FROM notes_fts JOIN notes n ON n.id = notes_fts.rowid "
+                "WHERE notes_fts MATCH :match AND n.is_deleted = 0 "
+                "ORDER BY rank LIMIT :limit"
+            ), params).all()
+            log_rows = db.execute(text(
+                "SELECT l.id, l.note_content, "
+                "snippet(logs_fts, 0, :start, :end, '…', 12), "
+                "bm25(logs_fts) AS rank "
+                "FROM logs_fts JOIN operation_logs l ON l.id = logs_fts.rowid "
+                "WHERE logs_fts MATCH :match "
+                "ORDER BY rank LIMIT :limit"
+            ), params).all()
             
-            return notes
+            results = [self._search_result("note", row) for row in note_rows]
+            results += [self._search_result("log", row) for row in log_rows]
+            results.sort(key=lambda result: result["rank"])
+            return results[:limit]
         finally:
             db.close()
 
+    def _search_like(self, db, terms, limit):
+        note_query = db.query(Note.id, Note.title).filter(Note.is_deleted == False)
+        log_query = db.query(OperationLog.id, OperationLog.note_content)
+        for term in terms:
+            pattern = like_pattern(term)
+            note_query = note_query.filter(or_(Note.title.like(pattern, escape="\\"),
+                                               Note.content.like(pattern, escape="\\")))
+            log_query = log_query.filter(OperationLog.note_content.like(pattern, escape="\\"))
+        # No relevance score without MATCH: newest first, notes before logs
+        rows = [("note", row) for row in note_query.order_by(Note.id.desc()).limit(limit)]
+        rows += [("log", row) for row in log_query.order_by(OperationLog.id.desc()).limit(limit)]
+        return [self._search_result(kind, (row[0], row[1], row[1], rank))
+                for rank, (kind, row) in enumerate(rows[:limit])]
+
+    def _search_result(self, kind, row):
+        return {
+            "kind": kind,
+            "id": row[0],
+            "title": row[1] or "",
+            "snippet": row[2] or "",
+            "rank": row[3],
+        }
+
+    _trigram = None
+
+    def _fts_uses_trigram(self, db):
+        if NoteManager._trigram is None:
+            sql = db.execute(text("SELECT sql FROM sqlite_master WHERE name = 'notes_fts'")).scalar()
+            NoteManager._trigram = bool(sql and "trigram" in sql)
+        return NoteManager._trigram
+
     def get_note(self, note_id):
+        flush_pending_writes()
         db = next(get_db())
         try:
             note = db.query(Note).filter(Note.id == note_id).first()
@@ -46,58 +227,174 @@ class NoteManager:
     def create_note(self, title, content, color="#FFF9E6"):
         db = next(get_db())
         try:
-            new_note = Note(title=title, content=content, color=color)
+            new_note = Note(title=title, content=content, color=color,
+                            status=status_from_color(color), priority=priority_from_color(color))
             db.add(new_note)
+            # The creation log row goes in with the same commit (core/audit.py)
             db.commit()
-            db.refresh(new_note)
-            
-            # Log creation
-            self.log_action(db, "create", title or "New Note")
             
+            # Reload after the commit expired it, so the detached note is usable
+            db.refresh(new_note)
             # Expunge to detach from session so it can be used after session closes
             db.expunge(new_note)
             return new_note
         finally:
             db.close()
 
-    def update_note(self, note_id, title=None, content=None, color=None):
+    def update_note(self, note_id, title=None, content=None, color=None, status=None, priority=None):
         db = next(get_db())
         try:
             note = db.query(Note).filter(Note.id == note_id).first()
             if note:
-                old_color = note.color
-                
+                # Callers that only pass a color still get status/priority kept in sync
+                if color and status is None:
+                    status = status_from_color(color)
+                if color and priority is None:
+                    priority = priority_from_color(color)
+
                 if title: note.title = title
                 if content: note.content = content
                 if color: note.color = color
+                if status is not None: note.status = status
+                if priority is not None: note.priority = priority
                 note.updated_at = datetime.now()
+                # A completion is logged by the audit hook in the same commit
                 db.commit()
-                db.refresh(note)
-                
-                # Log completion (hacky check based on color change to grey)
-                if color == "#e0e0e0" and old_color != "#e0e0e0":
-                    self.log_action(db, "complete", note.title)
-                # Log update (if not completion and title changed)
-                elif title and title != "New Note" and color != "#e0e0e0":
-                    # Only log significant updates if needed, maybe skip to avoid spam
-                    pass
                 
+                db.refresh(note)
                 db.expunge(note)
             return note
         finally:
             db.close()
 
+    def apply_note_changes(self, updates, deletes=()):
+        # Group commit for buffered edits (see core/write_queue.py): one transaction
+        # for every pending update, delete and their operation log rows (written
+        # by the audit hook).
+        # `updates` maps note_id -> {field: value}; `deletes` is a set of note ids.
+        note_ids = set(updates) | set(deletes)
+        if not note_ids:
+            return
+        db = next(get_db())
+        try:
+            notes = {note.id: note for note in db.query(Note).filter(Note.id.in_(note_ids))}
+            now = datetime.now()
+            
+            for note_id, fields in updates.items():
+                note = notes.get(note_id)
+                if note is None or note_id in deletes:
+                    continue
+                for key, value in fields.items():
+                    setattr(note, key, value)
+                note.updated_at = now
+            
+            for note_id in deletes:
+                note = notes.get(note_id)
+                if note:
+                    db.delete(note)
+            
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    # --- Bulk operations: one transaction, executemany inserts, batched log rows.
+    # Set-based statements bypass the audit hook, so they record their own logs. ---
+
+    def create_notes_bulk(self, items):
+        # `items` are titles or (title, content, color) tuples. Returns the new
+        # notes (detached) in the order given.
+        rows = []
+        for item in items:
+            title, content, color = (item, "", COLOR_DEFAULT) if isinstance(item, str) else item
+            rows.append({"title": title, "content": content, "color": color,
+                         "status": status_from_color(color), "priority": priority_from_color(color),
+                         "is_deleted": False})
+        if not rows:
+            return []
+        db = next(get_db())
+        try:
+            notes = db.scalars(insert(Note).returning(Note, sort_by_parameter_order=True), rows).all()
+            record_many(db, "create", [(note.id, None) for note in notes])
+            # RETURNING already loaded every column; detach before the commit expires them
+            db.expunge_all()
+            db.commit()
+            return notes
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def complete_many(self, note_ids):
+        # Returns the number of notes that were not completed before
+        return self._set_state_many(note_ids, COLOR_COMPLETED, STATUS_COMPLETED, PRIORITY_NORMAL)
+
+    def set_priority_many(self, note_ids, priority):
+        # Same effect as toggling urgency on each note: marking urgent reopens
+        # completed notes, clearing urgency leaves them completed
+        if priority == PRIORITY_HIGH:
+            return self._set_state_many(note_ids, COLOR_URGENT, STATUS_ACTIVE, priority)
+        return self._set_state_many(note_ids, COLOR_DEFAULT, STATUS_ACTIVE, priority, skip_completed=True)
+
+    def delete_many(self, note_ids):
+        # Hard delete like delete_note; returns the number of notes removed
+        db = next(get_db())
+        try:
+            count = 0
+            for batch in batched(note_ids):
+                notes = db.query(Note.id, Note.title).filter(Note.id.in_(batch)).order_by(Note.id).all()
+                if not notes:
+                    continue
+                db.execute(delete(Note).where(Note.id.in_(batch)))
+                forget_notes(db, notes)
+                count += len(notes)
+            db.commit()
+            return count
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _set_state_many(self, note_ids, color, status, priority, skip_completed=False):
+        db = next(get_db())
+        try:
+            now = datetime.now()
+            completed = []
+            count = 0
+            for batch in batched(note_ids):
+                if status == STATUS_COMPLETED:
+                    completed += [(note_id, None) for (note_id,) in db.query(Note.id).filter(
+                        Note.id.in_(batch), Note.status != STATUS_COMPLETED).order_by(Note.id)]
+                stmt = update(Note).where(Note.id.in_(batch))
+                if skip_completed:
+                    stmt = stmt.where(Note.status != STATUS_COMPLETED)
+                result = db.execute(
+                    stmt.values(color=color, status=status, priority=priority, updated_at=now),
+                    execution_options={"synchronize_session": False},
+                )
+                count += result.rowcount
+            # Log completion
+            record_many(db, "complete", completed)
+            db.commit()
+            return len(completed) if status == STATUS_COMPLETED else count
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
     def delete_note(self, note_id):
         db = next(get_db())
         try:
             note = db.query(Note).filter(Note.id == note_id).first()
             if note:
                 # Hard delete as requested for robust removal
-                title = note.title
                 db.delete(note)
                 db.commit()
-                
-                self.log_action(db, "delete", title)
                 return True
             return False
         except Exception as e:
@@ -113,9 +410,6 @@ class NoteManager:
         if note:
             note.is_deleted = False
             db.commit()
-            
-            self.log_action(db, "restore", note.title)
-            
             return True
         return False
 
@@ -128,19 +422,67 @@ class NoteManager:
             return True
         return False
 
-    def log_action(self, db, action_type, content):
-        if not content:
-            content = "Empty Note"
-        # Use local time for created_at to ensure UI shows correct Beijing Time (or system time)
-        log = OperationLog(action_type=action_type, note_content=content, created_at=datetime.now())
-        db.add(log)
-        db.commit()
+    def prune_logs(self, retention_days=None, batch_size=None):
+        # Rolls operation logs older than the retention window into per-day counts
+        # (operation_log_daily) and deletes them. Works in short batches, each its
+        # own transaction, so other writers are never blocked for long.
+        # Returns the number of log rows removed.
+        profile = app_config.get_storage_profile()
+        if retention_days is None:
+            retention_days = profile["log_retention_days"]
+        if batch_size is None:
+            batch_size = profile["log_prune_batch_size"]
+        if not retention_days:
+            return 0
+        cutoff = datetime.combine(datetime.now().date() - timedelta(days=retention_days),
+                                  datetime.min.time())
+
+        removed = 0
+        while True:
+            db = next(get_db())
+            try:
+                ids = [log_id for (log_id,) in db.query(OperationLog.id).filter(
+                    OperationLog.created_at < cutoff).order_by(OperationLog.id).limit(batch_size)]
+                if not ids:
+                    return removed
+                day = func.date(OperationLog.created_at)
+                counts = db.query(day, OperationLog.action_type, func.count()).filter(
+                    OperationLog.id.in_(ids)).group_by(day, OperationLog.action_type).all()
+                rollup = sqlite_insert(OperationLogDaily).values(
+                    [{"day": d, "action_type": action_type, "count": count} for d, action_type, count in counts])
+                db.execute(rollup.on_conflict_do_update(
+                    index_elements=["day", "action_type"],
+                    set_={"count": OperationLogDaily.count + rollup.excluded["count"]},
+                ))
+                db.execute(delete(OperationLog).where(OperationLog.id.in_(ids)))
+                db.commit()
+                removed += len(ids)
+            except Exception:
+                db.rollback()
+                raise
+            finally:
+                db.close()
+            if len(ids) < batch_size:
+                return removed
+
+    def resolve_log_titles(self, db, logs):
+        # Entries of notes that still exist carry only note_id; fill in the
+        # current title on the (detached) log objects
+        missing = {log.note_id for log in logs if log.note_content is None and log.note_id is not None}
+        titles = {}
+        for batch in batched(missing):
+            titles.update(db.query(Note.id, Note.title).filter(Note.id.in_(batch)).all())
+        for log in logs:
+            if log.note_content is None:
+                log.note_content = titles.get(log.note_id) or EMPTY_TITLE
+        return logs
 
     def clear_all_logs(self):
         db = next(get_db())
         try:
-            # Delete all logs
+            # Delete all logs, including the rolled-up history
             db.query(OperationLog).delete()
+            db.query(OperationLogDaily).delete()
             db.commit()
             return True
         except Exception as e:
@@ -151,21 +493,95 @@ class NoteManager:
             db.close()
 
     def get_logs(self):
+        flush_pending_writes()
         db = next(get_db())
         try:
-            return db.query(OperationLog).order_by(OperationLog.created_at.desc()).all()
+            logs = db.query(OperationLog).order_by(OperationLog.created_at.desc()).all()
+            db.expunge_all()
+            return self.resolve_log_titles(db, logs)
         finally:
             db.close()
 
     def get_logs_by_date(self, date_obj):
+        # Filter by date range for the specific day
+        start = datetime.combine(date_obj, datetime.min.time())
+        return self.get_logs_between(start, start + timedelta(days=1))
+
+    def latest_log_id(self):
+        # Change cursor for the operation log (0 when it is empty). New entries
+        # get higher ids, but ids are reused once the newest rows are gone, so
+        # readers must reload after clear_all_logs or a backup restore.
+        flush_pending_writes()
+        db = next(get_db())
+        try:
+            return db.query(func.max(OperationLog.id)).scalar() or 0
+        finally:
+            db.close()
+
+    def get_logs_after(self, log_id, limit=None):
+        # Entries added since latest_log_id() returned `log_id`, newest first
+        flush_pending_writes()
+        db = next(get_db())
+        try:
+            query = db.query(OperationLog).filter(OperationLog.id > log_id).order_by(
+                *order_clauses(LOG_ORDER))
+            if limit is not None:
+                query = query.limit(limit)
+            logs = query.all()
+            db.expunge_all()
+            return self.resolve_log_titles(db, logs)
+        finally:
+            db.close()
+
+    def get_logs_between(self, start=None, end=None, limit=None, action_type=None):
+        # Logs with start <= created_at < end, newest first, served from
+        # ix_operation_logs_created_at (or the action_type index when filtering)
+        flush_pending_writes()
         db = next(get_db())
         try:
-            # Filter by date range for the specific day
-            start = datetime.combine(date_obj, datetime.min.time())
-            end = datetime.combine(date_obj, datetime.max.time())
-            return db.query(OperationLog).filter(
-                OperationLog.created_at >= start,
-                OperationLog.created_at <= end
-            ).order_by(OperationLog.created_at.desc()).all()
+            query = db.query(OperationLog)
+            if start is not None:
+                query = query.filter(OperationLog.created_at >= start)
+            if end is not None:
+                query = query.filter(OperationLog.created_at < end)
+            if action_type is not None:
+                query = query.filter(OperationLog.action_type == action_type)
+            query = query.order_by(*order_clauses(LOG_ORDER))
+            if limit is not None:
+                query = query.limit(limit)
+            logs = query.all()
+            db.expunge_all()
+            return self.resolve_log_titles(db, logs)
+        finally:
+            db.close()
+
+    def count_logs_by_day(self, start, end, action_type=None):
+        # {date: {action_type: count}} for days in [start, end), grouped in SQL.
+        # Days that aged out of retention are read from operation_log_daily.
+        flush_pending_writes()
+        start_day = start.date() if isinstance(start, datetime) else start
+        end_day = end.date() if isinstance(end, datetime) else end
+        db = next(get_db())
+        try:
+            day = func.date(OperationLog.created_at)
+            query = db.query(day, OperationLog.action_type, func.count()).filter(
+                OperationLog.created_at >= datetime.combine(start_day, datetime.min.time()),
+                OperationLog.created_at < datetime.combine(end_day, datetime.min.time()),
+            )
+            rollup = db.query(OperationLogDaily.day, OperationLogDaily.action_type,
+                              OperationLogDaily.count).filter(
+                OperationLogDaily.day >= start_day.isoformat(),
+                OperationLogDaily.day < end_day.isoformat(),
+            )
+            if action_type is not None:
+                query = query.filter(OperationLog.action_type == action_type)
+                rollup = rollup.filter(OperationLogDaily.action_type == action_type)
+
+            counts = {}
+            for rows in (query.group_by(day, OperationLog.action_type), rollup):
+                for day_str, action, count in rows:
+                    per_day = counts.setdefault(date.fromisoformat(day_str), {})
+                    per_day[action] = per_day.get(action, 0) + count
+            return counts
         finally:
             db.close()
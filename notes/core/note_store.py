@@ -0,0 +1,315 @@
+from PySide6.QtCore import QObject, Signal
+from bisect import bisect_left
+from datetime import datetime
+from .note_manager import NoteManager
+from .write_queue import WriteQueue
+from .db_worker import get_db_worker
+from .models import (STATUS_ACTIVE, STATUS_COMPLETED, PRIORITY_NORMAL, PRIORITY_HIGH,
+                     COLOR_DEFAULT, COLOR_COMPLETED, COLOR_URGENT)
+
+class NoteSummary:
+    # Plain in-memory copy of the fields the list needs, no session attached
+    __slots__ = ("id", "title", "content", "color", "status", "priority", "created_at")
+
+    def __init__(self, id, title, content, color, status, priority, created_at):
+        self.id = id
+        self.title = title
+        self.content = content
+        self.color = color
+        self.status = status
+        self.priority = priority
+        self.created_at = created_at
+
+    @classmethod
+    def from_note(cls, note):
+        return cls(note.id, note.title, note.content, note.color,
+                   note.status or STATUS_ACTIVE, note.priority or PRIORITY_NORMAL, note.created_at)
+
+    @property
+    def is_completed(self):
+        return self.status == STATUS_COMPLETED
+
+    @property
+    def is_urgent(self):
+        return self.priority == PRIORITY_HIGH and not self.is_completed
+
+    def sort_key(self):
+        # Same order as NoteManager.get_all_notes: open first, urgent first, newest first
+        created = self.created_at.timestamp() if self.created_at else 0
+        return (self.status, -self.priority, -created, -self.id)
+
+class NoteStore(QObject):
+    note_added = Signal(object, int) # summary, row
+    note_updated = Signal(object, int) # summary, row
+    note_removed = Signal(int, int) # note_id, row
+    note_moved = Signal(int, int, int) # note_id, from_row, to_row
+    note_rekeyed = Signal(int, int) # temporary id, real id
+    reloaded = Signal()
+    batch_changed = Signal() # many notes changed at once; views re-sync with all()
+    write_failed = Signal(str) # error message; the store has already rolled back
+
+    def __init__(self, manager=None, parent=None):
+        super().__init__(parent)
+        self.manager = manager or NoteManager()
+        self.worker = get_db_worker()
+        # Edits are buffered and group-committed on the worker thread
+        self.writes = WriteQueue(self.manager, worker=self.worker, parent=self)
+        self.writes.flush_failed.connect(self.on_flush_failed)
+        self.notes = {} # note_id -> NoteSummary (identity map)
+        self.order = [] # note ids in display order
+        self.keys = [] # sort keys, parallel to self.order
+        self.loaded = False
+
+        # Optimistic creates not yet confirmed by the worker use negative ids
+        self.next_temp_id = -1
+        self.deleted_temp_ids = set()
+
+    # --- Reads (memory only once loaded) ---
+
+    def load(self):
+        # Cold load; replaces the identity map with fresh summaries
+        summaries = [NoteSummary.from_note(note) for note in self.manager.iter_notes()]
+        self.notes = {summary.id: summary for summary in summaries}
+        self.order = [summary.id for summary in summaries]
+        self.keys = [summary.sort_key() for summary in summaries]
+        self.loaded = True
+        self.reloaded.emit()
+
+    def ensure_loaded(self):
+        if not self.loaded:
+            self.load()
+
+    def get(self, note_id):
+        return self.notes.get(note_id)
+
+    def all(self):
+        return [self.notes[note_id] for note_id in self.order]
+
+    def row_of(self, note_id):
+        summary = self.notes.get(note_id)
+        if summary is None:
+            return -1
+        return bisect_left(self.keys, summary.sort_key())
+
+    def __len__(self):
+        return len(self.order)
+
+    def flush(self):
+        self.writes.flush()
+
+    # --- Writes (memory first, then through the write queue to SQLite) ---
+
+    def create(self, title, content="", color=COLOR_DEFAULT):
+        # Shown immediately under a temporary id; the worker confirms or we roll back
+        temp_id = self.next_temp_id
+        self.next_temp_id -= 1
+        summary = NoteSummary(temp_id, title, content, color, STATUS_ACTIVE, PRIORITY_NORMAL,
+                              datetime.utcnow())
+        self.notes[temp_id] = summary
+        row = self._insert_sorted(summary)
+        self.note_added.emit(summary, row)
+
+        self.worker.submit(
+            self.manager.create_note, title, content, color,
+            on_success=lambda note: self.on_create_confirmed(temp_id, note),
+            on_error=lambda e: self.on_create_failed(temp_id, e),
+        )
+        return summary
+
+    def is_pending(self, note_id):
+        return note_id < 0
+
+    def set_title(self, note_id, title):
+        summary = self.notes.get(note_id)
+        if summary is None or summary.title == title:
+            return
+        if not self.is_pending(note_id):
+            self.writes.update(note_id, title=title)
+        summary.title = title
+        self.note_updated.emit(summary, self.row_of(note_id))
+
+    def set_urgent(self, note_id, is_urgent):
+        if is_urgent:
+            self._update_state(note_id, COLOR_URGENT, STATUS_ACTIVE, PRIORITY_HIGH)
+        else:
+            self._update_state(note_id, COLOR_DEFAULT, STATUS_ACTIVE, PRIORITY_NORMAL)
+
+    def set_completed(self, note_id, is_completed):
+        if is_completed:
+            self._update_state(note_id, COLOR_COMPLETED, STATUS_COMPLETED, PRIORITY_NORMAL)
+        else:
+            self._update_state(note_id, COLOR_DEFAULT, STATUS_ACTIVE, PRIORITY_NORMAL)
+
+    def delete(self, note_id):
+        if note_id not in self.notes:
+            return False
+        if self.is_pending(note_id):
+            self.deleted_temp_ids.add(note_id)
+        else:
+            self.writes.delete(note_id)
+        row = self._remove_sorted(note_id)
+        del self.notes[note_id]
+        self.note_removed.emit(note_id, row)
+        return True
+
+    # --- Batch writes (one transaction on the worker, one view update) ---
+
+    def create_many(self, titles):
+        # Not optimistic: rows appear once the bulk insert has landed
+        self.worker.submit(
+            self.manager.create_notes_bulk, list(titles),
+            on_success=self.on_bulk_created,
+            on_error=lambda e: self.on_flush_failed(str(e)),
+        )
+
+    def complete_many(self, note_ids):
+        self._update_state_many(note_ids, COLOR_COMPLETED, STATUS_COMPLETED, PRIORITY_NORMAL,
+                                self.manager.complete_many)
+
+    def set_urgent_many(self, note_ids, is_urgent):
+        if is_urgent:
+            color, priority = COLOR_URGENT, PRIORITY_HIGH
+        else:
+            color, priority = COLOR_DEFAULT, PRIORITY_NORMAL
+            # Clearing urgency never reopens completed notes
+            note_ids = [note_id for note_id in note_ids
+                        if note_id in self.notes and not self.notes[note_id].is_completed]
+        self._update_state_many(note_ids, color, STATUS_ACTIVE, priority,
+                                lambda ids: self.manager.set_priority_many(ids, priority))
+
+    def delete_many(self, note_ids):
+        note_ids = [note_id for note_id in note_ids if note_id in self.notes]
+        if not note_ids:
+            return 0
+        saved = []
+        for note_id in note_ids:
+            if self.is_pending(note_id):
+                self.deleted_temp_ids.add(note_id)
+            else:
+                saved.append(note_id)
+            del self.notes[note_id]
+        self._submit_batch(self.manager.delete_many, saved)
+        self._resort()
+        self.batch_changed.emit()
+        return len(note_ids)
+
+    # --- Worker results ---
+
+    def on_create_confirmed(self, temp_id, note):
+        if temp_id in self.deleted_temp_ids:
+            # Deleted before the insert landed
+            self.deleted_temp_ids.discard(temp_id)
+            self.writes.delete(note.id)
+            return
+        summary = self.notes.pop(temp_id, None)
+        if summary is None:
+            return
+
+        from_row = self._remove_sorted_key(summary.sort_key())
+        summary.id = note.id
+        summary.created_at = note.created_at
+        self.notes[note.id] = summary
+        to_row = self._insert_sorted(summary)
+        self.note_rekeyed.emit(temp_id, note.id)
+        if from_row != to_row:
+            self.note_moved.emit(note.id, from_row, to_row)
+
+        # Edits made while the insert was in flight only changed memory
+        changes = {}
+        for field in ("title", "color", "status", "priority"):
+            if getattr(summary, field) != getattr(note, field):
+                changes[field] = getattr(summary, field)
+        if changes:
+            self.writes.update(note.id, **changes)
+
+    def on_bulk_created(self, notes):
+        for note in notes:
+            self.notes[note.id] = NoteSummary.from_note(note)
+        self._resort()
+        self.batch_changed.emit()
+
+    def on_create_failed(self, temp_id, error):
+        self.deleted_temp_ids.discard(temp_id)
+        if temp_id in self.notes:
+            row = self._remove_sorted(temp_id)
+            del self.notes[temp_id]
+            self.note_removed.emit(temp_id, row)
+        self.write_failed.emit(str(error))
+
+    def on_flush_failed(self, message):
+        # The batch was rolled back in SQLite; reload so memory matches it again
+        self.load()
+        self.write_failed.emit(message)
+
+    # --- Internals ---
+
+    def _update_state(self, note_id, color, status, priority):
+        summary = self.notes.get(note_id)
+        if summary is None:
+            return
+        if (summary.color, summary.status, summary.priority) == (color, status, priority):
+            return
+        if not self.is_pending(note_id):
+            self.writes.update(note_id, color=color, status=status, priority=priority)
+
+        from_row = self._remove_sorted(note_id)
+        summary.color, summary.status, summary.priority = color, status, priority
+        to_row = self._insert_sorted(summary)
+
+        if from_row != to_row:
+            self.note_moved.emit(note_id, from_row, to_row)
+        self.note_updated.emit(summary, to_row)
+
+    def _update_state_many(self, note_ids, color, status, priority, write):
+        changed = []
+        for note_id in note_ids:
+            summary = self.notes.get(note_id)
+            if summary is None:
+                continue
+            if (summary.color, summary.status, summary.priority) == (color, status, priority):
+                continue
+            summary.color, summary.status, summary.priority = color, status, priority
+            changed.append(note_id)
+        if not changed:
+            return
+        # Pending creates pick the new state up in on_create_confirmed
+        self._submit_batch(write, [note_id for note_id in changed if not self.is_pending(note_id)])
+        self._resort()
+        self.batch_changed.emit()
+
+    def _submit_batch(self, write, note_ids):
+        if not note_ids:
+            return
+        # Buffered single-note edits go first so the worker applies them in order
+        self.writes.flush()
+        self.worker.submit(write, note_ids, on_error=lambda e: self.on_flush_failed(str(e)))
+
+    def _resort(self):
+        summaries = sorted(self.notes.values(), key=NoteSummary.sort_key)
+        self.order = [summary.id for summary in summaries]
+        self.keys = [summary.sort_key() for summary in summaries]
+
+    def _insert_sorted(self, summary):
+        key = summary.sort_key()
+        row = bisect_left(self.keys, key)
+        self.keys.insert(row, key)
+        self.order.insert(row, summary.id)
+        return row
+
+    def _remove_sorted(self, note_id):
+        return self._remove_sorted_key(self.notes[note_id].sort_key())
+
+    def _remove_sorted_key(self, key):
+        row = bisect_left(self.keys, key)
+        del self.keys[row]
+        del self.order[row]
+        return row
+
+_store = None
+
+def get_note_store():
+    # Shared store so every widget sees the same identity map and signals
+    global _store
+    if _store is None:
+        _store = NoteStore()
+    return _store
@@ -0,0 +1,126 @@
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.units import mm
+from reportlab.lib import colors
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfbase.cidfonts import UnicodeCIDFont
+from reportlab.platypus import BaseDocTemplate, PageTemplate, Frame
+from xml.sax.saxutils import escape
+from app.constants import ASSETS_DIR
+import html
+import os
+import re
+
+# Flowable-based PDF reports. Pages are laid out by reportlab (wrapping, page
+# breaks, paragraphs split across pages); flowables are produced chunk by chunk
+# and consumed as they are placed, so only one chunk is alive at a time.
+
+FONT_NAME = "ReportCJK"
+FALLBACK_FONT = "STSong-Light" # Adobe CID font, rendered by the viewer and not embedded
+
+# TrueType fonts with CJK coverage, first found is embedded (subset).
+# .ttc entries are (path, index into the collection).
+FONT_CANDIDATES = [
+    os.path.join(ASSETS_DIR, "fonts", "report.ttf"),
+    (r"C:\Windows\Fonts\msyh.ttc", 0),
+    r"C:\Windows\Fonts\simhei.ttf",
+    (r"C:\Windows\Fonts\simsun.ttc", 0),
+    "/System/Library/Fonts/Supplemental/Songti.ttc",
+    "/Library/Fonts/Arial Unicode.ttf",
+    "/usr/share/fonts/truetype/wqy/wqy-microhei.ttc",
+    "/usr/share/fonts/truetype/arphic/uming.ttc",
+    "/usr/share/fonts/truetype/droid/DroidSansFallbackFull.ttf",
+]
+
+_font = None
+
+def report_font():
+    # Registers the report font once and returns its name
+    global _font
+    if _font is not None:
+        return _font
+    for candidate in FONT_CANDIDATES:
+        path, index = candidate if isinstance(candidate, tuple) else (candidate, 0)
+        if not os.path.exists(path):
+            continue
+        try:
+            pdfmetrics.registerFont(TTFont(FONT_NAME, path, subfontIndex=index))
+            _font = FONT_NAME
+            return _font
+        except Exception as e:
+            # e.g. CFF-outline collections, which reportlab cannot embed
+            print(f"Skipping report font {path}: {e}")
+    pdfmetrics.registerFont(UnicodeCIDFont(FALLBACK_FONT))
+    _font = FALLBACK_FONT
+    return _font
+
+def report_styles():
+    font = report_font()
+    return {
+        "title": ParagraphStyle("title", fontName=font, fontSize=18, leading=24, spaceAfter=4),
+        "subtitle": ParagraphStyle("subtitle", fontName=font, fontSize=9, leading=12,
+                                   textColor=colors.grey, spaceAfter=10),
+        "group": ParagraphStyle("group", fontName=font, fontSize=14, leading=20, spaceBefore=12,
+                                spaceAfter=6, textColor=colors.HexColor("#5C4B00"), keepWithNext=1),
+        "heading": ParagraphStyle("heading", fontName=font, fontSize=11.5, leading=16, spaceBefore=6,
+                                  keepWithNext=1),
+        "meta": ParagraphStyle("meta", fontName=font, fontSize=8, leading=11,
+                               textColor=colors.grey, keepWithNext=1),
+        # Default wrapping splits runs too long for a line (splitLongWords), which
+        # breaks unspaced Chinese text at the margin without the per-character
+        # cost of wordWrap="CJK"
+        "body": ParagraphStyle("body", fontName=font, fontSize=10, leading=15, spaceAfter=4),
+    }
+
+TAG_RE = re.compile(r"<[^>]+>")
+HEAD_RE = re.compile(r"<head>.*?</head>", re.S | re.I)
+BREAK_RE = re.compile(r"<br\s*/?>|</p>|</div>|</li>", re.I)
+
+def plain_text(content):
+    # Note content may be rich text HTML from the editor
+    if not content:
+        return ""
+    if "<" in content:
+        content = HEAD_RE.sub("", content)
+        content = BREAK_RE.sub("\n", content)
+        content = html.unescape(TAG_RE.sub("", content))
+    return content.strip()
+
+def paragraph_markup(text):
+    # Paragraph takes a small XML dialect; keep line breaks
+    return escape(text).replace("\n", "<br/>")
+
+class FlowableStream(list):
+    # The doc template consumes its flowable list from the front; this list
+    # pulls the next chunk in whenever it runs dry
+    def __init__(self, chunks):
+        super().__init__()
+        self.chunks = iter(chunks)
+
+    def __len__(self):
+        while not list.__len__(self):
+            chunk = next(self.chunks, None)
+            if chunk is None:
+                return 0
+            self.extend(chunk)
+        return list.__len__(self)
+
+class ReportDocument(BaseDocTemplate):
+    def __init__(self, filepath, title, **kwargs):
+        super().__init__(filepath, pagesize=A4, title=title, leftMargin=18 * mm, rightMargin=18 * mm,
+                         topMargin=18 * mm, bottomMargin=18 * mm, **kwargs)
+        frame = Frame(self.leftMargin, self.bottomMargin, self.width, self.height, id="body")
+        self.addPageTemplates([PageTemplate(id="page", frames=[frame], onPage=self.draw_footer)])
+
+    def draw_footer(self, canv, doc):
+        canv.saveState()
+        canv.setFont(report_font(), 8)
+        canv.setFillColor(colors.grey)
+        canv.drawCentredString(self.pagesize[0] / 2, 10 * mm, f"- {doc.page} -")
+        canv.restoreState()
+
+def build_report(filepath, title, chunks):
+    # chunks: iterable of flowable lists, laid out in order
+    ReportDocument(filepath, title).build(FlowableStream(chunks))
+
@@ -1,22 +1,63 @@
-from .database import get_db
-from .models import WorkLog, Note
+from .database import get_db, flush_pending_writes
+from .models import DailyStats, Note
+from . import daily_stats
+from .analytics import get_analytics
 from sqlalchemy import func
 import datetime
 
 class StatisticsManager:
-    def get_total_work_time(self, days=7):
+    # Reads per-day totals from daily_stats (one row per day) instead of
+    # scanning worklogs and notes
+    def get_daily_stats(self, days=7):
+        # Rows for the last `days` calendar days including today, oldest first;
+        # days without activity have no row
+        flush_pending_writes()
         db = next(get_db())
-        cutoff = datetime.datetime.utcnow() - datetime.timedelta(days=days)
-        result = db.query(func.sum(WorkLog.duration_minutes)).filter(WorkLog.date >= cutoff).scalar()
-        return result if result else 0
+        try:
+            start = datetime.date.today() - datetime.timedelta(days=days - 1)
+            rows = db.query(DailyStats).filter(DailyStats.day >= start.isoformat()) \
+                .order_by(DailyStats.day).all()
+            db.expunge_all()
+            return rows
+        finally:
+            db.close()
+
+    def get_total_work_time(self, days=7):
+        return sum(row.work_minutes for row in self.get_daily_stats(days))
 
     def get_notes_count(self):
+        flush_pending_writes()
         db = next(get_db())
-        return db.query(Note).filter(Note.is_deleted == False).count()
+        try:
+            # Counted from ix_notes_display_order (is_deleted is its first column)
+            return db.query(func.count(Note.id)).filter(Note.is_deleted == False).scalar()
+        finally:
+            db.close()
         
     def get_weekly_stats(self):
-        # Placeholder for more complex stats
+        rows = self.get_daily_stats(7)
         return {
-            "total_time": self.get_total_work_time(7),
-            "notes_count": self.get_notes_count()
+            "total_time": sum(row.work_minutes for row in rows),
+            "notes_count": self.get_notes_count(),
+            "notes_created": sum(row.notes_created for row in rows),
+            "notes_completed": sum(row.notes_completed for row in rows),
+            "notes_deleted": sum(row.notes_deleted for row in rows),
         }
+
+    def get_productivity_report(self, days=30):
+        # Rolling averages, streaks, hour heatmap, time to complete, tags (core/analytics.py)
+        return get_analytics().report(days)
+
+    def rebuild_daily_stats(self):
+        # Recompute daily_stats from scratch; returns the number of days written
+        flush_pending_writes()
+        db = next(get_db())
+        try:
+            days = daily_stats.rebuild(db)
+            db.commit()
+            return days
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
@@ -0,0 +1,80 @@
+from PySide6.QtCore import QObject, QThread, QTimer, Signal
+from .database import register_flush_hook
+from .db_worker import get_db_worker
+from app.config import app_config
+
+class WriteQueue(QObject):
+    # Coalesces note edits and writes them as one group commit.
+    #
+    # Repeated updates to the same note within the window are merged into one
+    # row update; a delete drops whatever was pending for that note. The window
+    # starts at the first buffered edit, so no edit waits longer than window_ms.
+    # Batches are written on the database worker thread.
+    flushed = Signal(int) # number of notes written
+    flush_failed = Signal(str) # error message
+
+    def __init__(self, manager, window_ms=None, worker=None, parent=None):
+        super().__init__(parent)
+        self.manager = manager
+        self.worker = worker or get_db_worker()
+        self.pending = {} # note_id -> merged field values
+        self.deletes = set()
+
+        if window_ms is None:
+            window_ms = app_config.get_storage_profile()["write_coalesce_ms"]
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(window_ms)
+        self.timer.timeout.connect(self.flush)
+
+        # Reads that need the latest data flush us first (see database.flush_pending_writes);
+        # reads running on the worker get the batch queued ahead of them
+        register_flush_hook(self.flush_now)
+        self.worker.before_submit.append(self.flush)
+
+    def update(self, note_id, **fields):
+        if note_id in self.deletes:
+            return
+        self.pending.setdefault(note_id, {}).update(fields)
+        self.schedule()
+
+    def delete(self, note_id):
+        self.pending.pop(note_id, None)
+        self.deletes.add(note_id)
+        self.schedule()
+
+    def has_pending(self):
+        return bool(self.pending or self.deletes)
+
+    def schedule(self):
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def flush(self):
+        # Hand the current batch to the worker; returns its Future (or None)
+        self.timer.stop()
+        if not self.has_pending():
+            return None
+
+        # Swap the buffers first so edits made during the write start a new batch
+        updates, deletes = self.pending, self.deletes
+        self.pending, self.deletes = {}, set()
+        count = len(updates) + len(deletes)
+        return self.worker.submit(
+            self.manager.apply_note_changes, updates, deletes,
+            on_success=lambda _: self.flushed.emit(count),
+            on_error=lambda e: self.flush_failed.emit(str(e)),
+        )
+
+    def flush_now(self):
+        # Synchronous flush for readers and shutdown. The buffers belong to our
+        # thread, so calls from the worker thread leave them alone: anything
+        # buffered when that task was submitted was already queued before it.
+        if QThread.currentThread() != self.thread():
+            return
+        future = self.flush()
+        if future is not None:
+            try:
+                future.result()
+            except Exception:
+                pass # Reported through flush_failed once dispatched
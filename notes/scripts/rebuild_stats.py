@@ -0,0 +1,17 @@
+import os
+import sys
+
+# Recompute the daily_stats table from worklogs and the operation log.
+# Usage: python scripts/rebuild_stats.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.database import init_db
+from core.statistics import StatisticsManager
+
+def main():
+    init_db()
+    days = StatisticsManager().rebuild_daily_stats()
+    print(f"daily_stats rebuilt: {days} days")
+
+if __name__ == "__main__":
+    main()
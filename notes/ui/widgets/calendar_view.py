@@ -1,28 +1,142 @@
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QCalendarWidget, QLabel, QHBoxLayout
 from PySide6.QtCore import QDate
+from PySide6.QtGui import QColor, QTextCharFormat
+from datetime import date, datetime
+from core.database import data_revision
+from core.db_worker import get_db_worker
+from core.note_manager import NoteManager
+from ui.widgets.log_list_view import ACTION_NAMES
+import math
+
+# Days are shaded with the accent color, more opaque with more activity
+ACTIVITY_COLOR = "#FFD166"
+ACTIVITY_LEVELS = 4
+
+def month_range(year, month):
+    # [first day, first day of the next month)
+    start = date(year, month, 1)
+    end = date(year + month // 12, month % 12 + 1, 1)
+    return start, end
+
+def neighbor_months(year, month):
+    previous = (year - 1, 12) if month == 1 else (year, month - 1)
+    following = (year + 1, 1) if month == 12 else (year, month + 1)
+    return previous, following
+
+class MonthActivity:
+    # Log counts and entries for one month, as of data revision `revision`
+    __slots__ = ("revision", "counts", "logs")
+
+    def __init__(self, revision, counts, logs):
+        self.revision = revision
+        self.counts = counts # date -> number of log entries
+        self.logs = logs # date -> [OperationLog], newest first
+
+def load_month(manager, year, month):
+    # Runs on the database worker: one GROUP BY for the counts, one range read for the entries
+    revision = data_revision()
+    start, end = month_range(year, month)
+    counts = {day: sum(per_action.values())
+              for day, per_action in manager.count_logs_by_day(start, end).items()}
+    logs = {}
+    for log in manager.get_logs_between(datetime.combine(start, datetime.min.time()),
+                                        datetime.combine(end, datetime.min.time())):
+        logs.setdefault(log.created_at.date(), []).append(log)
+    return MonthActivity(revision, counts, logs)
 
 class CalendarViewWidget(QWidget):
     def __init__(self):
         super().__init__()
+        self.manager = NoteManager()
+        self.months = {} # (year, month) -> MonthActivity
+        self.loading = set() # months with a request on the worker
         self.init_ui()
-        
+
     def init_ui(self):
         layout = QVBoxLayout(self)
-        
+
         # Calendar
         self.calendar = QCalendarWidget()
         self.calendar.setGridVisible(True)
         self.calendar.clicked.connect(self.on_date_selected)
+        self.calendar.currentPageChanged.connect(self.on_page_changed)
         layout.addWidget(self.calendar)
-        
+
         # Selected Date Info
         self.info_label = QLabel("选择日期查看日志")
         layout.addWidget(self.info_label)
-        
-        # Log List (Placeholder)
+
+        # Log List
         self.log_list = QLabel("暂无日志")
+        self.log_list.setWordWrap(True)
         layout.addWidget(self.log_list)
-        
-    def on_date_selected(self, date):
-        self.info_label.setText(f"选中日期: {date.toString('yyyy-MM-dd')}")
-        # Here query logs for the date
+
+    def showEvent(self, event):
+        # Revalidate the visible month; stale months keep their shading until reloaded
+        self.on_page_changed(self.calendar.yearShown(), self.calendar.monthShown())
+        super().showEvent(event)
+
+    def on_page_changed(self, year, month):
+        self.decorate_month(year, month)
+        self.request_month(year, month)
+        # Prefetch the neighbours so paging back and forth is instant
+        for neighbor in neighbor_months(year, month):
+            self.request_month(*neighbor)
+
+    def request_month(self, year, month):
+        key = (year, month)
+        cached = self.months.get(key)
+        if (cached is not None and cached.revision == data_revision()) or key in self.loading:
+            return
+        self.loading.add(key)
+        get_db_worker().submit(
+            load_month, self.manager, year, month,
+            on_success=lambda activity: self.on_month_loaded(key, activity),
+            on_error=lambda e: self.loading.discard(key),
+        )
+
+    def on_month_loaded(self, key, activity):
+        self.loading.discard(key)
+        self.months[key] = activity
+        if key == (self.calendar.yearShown(), self.calendar.monthShown()):
+            self.decorate_month(*key)
+            selected = self.calendar.selectedDate()
+            if (selected.year(), selected.month()) == key:
+                self.show_day(selected)
+
+    def decorate_month(self, year, month):
+        # A null date clears every cell format at once
+        self.calendar.setDateTextFormat(QDate(), QTextCharFormat())
+        activity = self.months.get((year, month))
+        if activity is None or not activity.counts:
+            return
+        peak = max(activity.counts.values())
+        for day, count in activity.counts.items():
+            level = math.ceil(count / peak * ACTIVITY_LEVELS)
+            color = QColor(ACTIVITY_COLOR)
+            color.setAlphaF(level / ACTIVITY_LEVELS)
+            cell_format = QTextCharFormat()
+            cell_format.setBackground(color)
+            cell_format.setToolTip(f"{count} 条操作记录")
+            self.calendar.setDateTextFormat(QDate(day.year, day.month, day.day), cell_format)
+
+    def on_date_selected(self, qdate):
+        self.info_label.setText(f"选中日期: {qdate.toString('yyyy-MM-dd')}")
+        self.show_day(qdate)
+
+    def show_day(self, qdate):
+        # Served from the month cache; no query per click
+        activity = self.months.get((qdate.year(), qdate.month()))
+        if activity is None:
+            self.log_list.setText("加载中...")
+            self.request_month(qdate.year(), qdate.month())
+            return
+        logs = activity.logs.get(date(qdate.year(), qdate.month(), qdate.day()), [])
+        if not logs:
+            count = activity.counts.get(date(qdate.year(), qdate.month(), qdate.day()), 0)
+            # Entries past the retention window only survive as daily counts
+            self.log_list.setText(f"共 {count} 条操作记录（明细已归档）" if count else "暂无日志")
+            return
+        lines = [f"{log.created_at.strftime('%H:%M')}  {ACTION_NAMES.get(log.action_type, log.action_type)}"
+                 f"  {log.note_content or '无内容'}" for log in logs]
+        self.log_list.setText("\n".join(lines))
@@ -0,0 +1,246 @@
+from PySide6.QtWidgets import QListView, QStyledItemDelegate, QStyle, QAbstractItemView
+from PySide6.QtCore import Qt, QAbstractListModel, QModelIndex, QRect, QRectF, QSize
+from PySide6.QtGui import QColor, QFont, QPainter, QPen
+from datetime import datetime
+from app.config import app_config
+from ui.widgets.note_list_view import rgba
+
+HEADER_HEIGHT = 36
+ENTRY_HEIGHT = 56
+ENTRY_SPACING = 5
+LOG_PAGE_SIZE = 100
+
+ROW_HEADER = "header"
+ROW_ENTRY = "entry"
+
+ACTION_NAMES = {
+    "create": "新建便签",
+    "complete": "完成任务",
+    "delete": "删除便签",
+    "restore": "恢复便签"
+}
+
+def log_day(log):
+    return log.created_at.date()
+
+def relative_day_text(day, today):
+    # Calculate friendly date
+    delta = (today - day).days
+    if delta == 0:
+        return "今天"
+    elif delta > 0:
+        return f"{delta * -1}" # Shows -1, -2, etc.
+    return day.strftime("%Y-%m-%d") # Future date? Should not happen
+
+def group_rows(logs, previous_day=None):
+    # Rows for logs in display order, with a header wherever the day changes
+    rows = []
+    for log in logs:
+        day = log_day(log)
+        if day != previous_day:
+            rows.append((ROW_HEADER, day))
+            previous_day = day
+        rows.append((ROW_ENTRY, log))
+    return rows
+
+class LogListModel(QAbstractListModel):
+    # Operation log, newest first, with a header row per day. Pages are read from
+    # the database as the view scrolls (canFetchMore/fetchMore); new entries are
+    # prepended using the log's id cursor (NoteManager.latest_log_id).
+    KindRole = Qt.UserRole + 1
+    DayRole = Qt.UserRole + 2
+    ActionRole = Qt.UserRole + 3
+
+    def __init__(self, manager, page_size=LOG_PAGE_SIZE, parent=None):
+        super().__init__(parent)
+        self.manager = manager
+        self.page_size = page_size
+        self.rows = [] # (ROW_HEADER, date) or (ROW_ENTRY, OperationLog)
+        self.pages = None
+        self.exhausted = True
+        self.last_log_id = 0
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        kind, value = self.rows[index.row()]
+        if role == self.KindRole:
+            return kind
+        if kind == ROW_HEADER:
+            if role == Qt.DisplayRole:
+                # Relative to the current day, so headers relabel themselves after midnight
+                return relative_day_text(value, datetime.now().date())
+            if role == self.DayRole:
+                return value
+            return None
+        if role == Qt.DisplayRole:
+            return value.note_content or "无内容"
+        if role == self.DayRole:
+            return log_day(value)
+        if role == self.ActionRole:
+            return ACTION_NAMES.get(value.action_type, value.action_type)
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled
+
+    # --- Paging ---
+
+    def reload(self):
+        self.beginResetModel()
+        self.rows = []
+        # Read the cursor first so entries added during the first page are picked up next time
+        self.last_log_id = self.manager.latest_log_id()
+        self.pages = self.manager.iter_log_pages(self.page_size)
+        self.exhausted = False
+        self.endResetModel()
+        self.fetchMore(QModelIndex())
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self.exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self.exhausted:
+            return
+        page, cursor = next(self.pages, ([], None))
+        if cursor is None:
+            self.exhausted = True
+            self.pages = None
+        if page:
+            self.last_log_id = max(self.last_log_id, max(log.id for log in page))
+        rows = group_rows(page, self.last_day())
+        if rows:
+            self.beginInsertRows(QModelIndex(), len(self.rows), len(self.rows) + len(rows) - 1)
+            self.rows.extend(rows)
+            self.endInsertRows()
+
+    def last_day(self):
+        if not self.rows:
+            return None
+        kind, value = self.rows[-1]
+        return value if kind == ROW_HEADER else log_day(value)
+
+    # --- New entries ---
+
+    def update(self):
+        # Prepends entries added since the last read; returns False when there were none
+        latest = self.manager.latest_log_id()
+        if latest == self.last_log_id:
+            return False
+        if latest < self.last_log_id:
+            # Newest entries removed; clear_all_logs and restores reload themselves,
+            # this catches the rest
+            self.reload()
+            return True
+
+        new_logs = self.manager.get_logs_after(self.last_log_id, limit=self.page_size + 1)
+        newest = self.rows[1][1].created_at if len(self.rows) > 1 else None
+        if len(new_logs) > self.page_size or (newest is not None and new_logs
+                                              and new_logs[-1].created_at < newest):
+            # Too much to splice in, or backdated entries (imports) that belong
+            # further down; start over from the top
+            self.reload()
+            return True
+        self.last_log_id = latest
+
+        # New entries are no older than the top entry: the oldest of them may
+        # join its group under the existing header, the rest get headers of their own
+        top_day = self.rows[0][1] if self.rows else None
+        same_day = [log for log in new_logs if log_day(log) == top_day]
+        newer = [log for log in new_logs if log_day(log) != top_day]
+        if same_day:
+            self.beginInsertRows(QModelIndex(), 1, len(same_day))
+            self.rows[1:1] = [(ROW_ENTRY, log) for log in same_day]
+            self.endInsertRows()
+        rows = group_rows(newer)
+        if rows:
+            self.beginInsertRows(QModelIndex(), 0, len(rows) - 1)
+            self.rows[0:0] = rows
+            self.endInsertRows()
+        return True
+
+class LogItemDelegate(QStyledItemDelegate):
+    # Paints day headers and log cards (same look as the old LogItem frames)
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.update_style()
+
+    def update_style(self):
+        theme = app_config.settings.get("theme", "light_glass")
+        self.is_dark = (theme == "dark_glass")
+        if self.is_dark:
+            self.bg_color = rgba(255, 255, 255, 0.08)
+            self.border_color = rgba(255, 255, 255, 0.15)
+            self.text_primary = QColor("#ffffff")
+            self.text_secondary = rgba(255, 255, 255, 0.6)
+            self.hover_bg = rgba(255, 255, 255, 0.12)
+            self.header_color = QColor("#aaa")
+        else:
+            self.bg_color = rgba(255, 255, 255, 0.6)
+            self.border_color = rgba(255, 255, 255, 0.8)
+            self.text_primary = QColor("#333333")
+            self.text_secondary = QColor("#666666")
+            self.hover_bg = rgba(255, 255, 255, 0.8)
+            self.header_color = QColor("#666")
+
+    def sizeHint(self, option, index):
+        if index.data(LogListModel.KindRole) == ROW_HEADER:
+            return QSize(option.rect.width(), HEADER_HEIGHT)
+        return QSize(option.rect.width(), ENTRY_HEIGHT + ENTRY_SPACING)
+
+    def paint(self, painter, option, index):
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        font = QFont(option.font)
+
+        if index.data(LogListModel.KindRole) == ROW_HEADER:
+            font.setBold(True)
+            painter.setFont(font)
+            painter.setPen(self.header_color)
+            rect = option.rect.adjusted(2, 10, 0, -5)
+            painter.drawText(rect, Qt.AlignLeft | Qt.AlignVCenter, index.data(Qt.DisplayRole))
+            painter.restore()
+            return
+
+        # Card
+        card = option.rect.adjusted(0, 0, 0, -ENTRY_SPACING)
+        hovered = bool(option.state & QStyle.State_MouseOver)
+        painter.setPen(QPen(self.border_color, 1))
+        painter.setBrush(self.hover_bg if hovered else self.bg_color)
+        painter.drawRoundedRect(QRectF(card).adjusted(0.5, 0.5, -0.5, -0.5), 12, 12)
+
+        # Note content, then the action name below it
+        text_rect = card.adjusted(15, 10, -15, -10)
+        font.setPixelSize(14)
+        font.setWeight(QFont.Medium)
+        painter.setFont(font)
+        painter.setPen(self.text_primary)
+        content_rect = QRect(text_rect.left(), text_rect.top(), text_rect.width(), 20)
+        text = painter.fontMetrics().elidedText(index.data(Qt.DisplayRole), Qt.ElideRight, content_rect.width())
+        painter.drawText(content_rect, Qt.AlignLeft | Qt.AlignVCenter, text)
+
+        font.setPixelSize(11)
+        font.setWeight(QFont.Normal)
+        painter.setFont(font)
+        painter.setPen(self.text_secondary)
+        meta_rect = QRect(text_rect.left(), content_rect.bottom() + 2, text_rect.width(), 14)
+        painter.drawText(meta_rect, Qt.AlignLeft | Qt.AlignVCenter, index.data(LogListModel.ActionRole))
+        painter.restore()
+
+class LogListView(QListView):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setMouseTracking(True) # Hover highlight
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setSelectionMode(QAbstractItemView.NoSelection)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setFrameShape(QListView.NoFrame)
+        self.setStyleSheet("QListView { background: transparent; border: none; outline: none; }"
+                           "QListView::item { background: transparent; border: none; }")
+        self.viewport().setAttribute(Qt.WA_Hover)
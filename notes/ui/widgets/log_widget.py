@@ -1,96 +1,9 @@
-from PySide6.QtWidgets import (QWidget, QVBoxLayout, QLabel, QScrollArea, QFrame, QHBoxLayout, QPushButton, QMessageBox)
-from PySide6.QtCore import Qt, QDate
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QLabel, QHBoxLayout, QPushButton, QMessageBox)
+from PySide6.QtCore import Qt
 from core.note_manager import NoteManager
-from datetime import datetime, timedelta
+from datetime import datetime
 from app.config import app_config
-
-class LogItem(QFrame):
-    def __init__(self, log, parent=None):
-        super().__init__(parent)
-        self.log = log
-        self.init_ui()
-        self.update_style()
-        
-    def init_ui(self):
-        self.layout = QHBoxLayout(self)
-        self.layout.setContentsMargins(15, 12, 15, 12)
-        self.layout.setSpacing(15)
-        
-        # Action Icon
-        # action_map = {
-        #     "create": "🆕",
-        #     "complete": "✅",
-        #     "delete": "🗑️",
-        #     "restore": "♻️"
-        # }
-        # icon_text = action_map.get(self.log.action_type, "📝")
-        # self.icon_lbl = QLabel(icon_text)
-        # self.icon_lbl.setFixedSize(24, 24)
-        # self.icon_lbl.setAlignment(Qt.AlignCenter)
-        # self.icon_lbl.setStyleSheet("font-size: 16px; background: transparent; border: none;")
-        # self.layout.addWidget(self.icon_lbl)
-        
-        # Content Layout (Vertical)
-        content_layout = QVBoxLayout()
-        content_layout.setSpacing(4)
-        
-        # Note Content
-        content_text = self.log.note_content or "无内容"
-        if len(content_text) > 18:
-            content_text = content_text[:18] + "..."
-            
-        self.content_lbl = QLabel(content_text)
-        self.content_lbl.setStyleSheet("font-size: 14px; background: transparent; border: none;")
-        content_layout.addWidget(self.content_lbl)
-        
-        # Time & Action Name
-        action_name_map = {
-            "create": "新建便签",
-            "complete": "完成任务",
-            "delete": "删除便签",
-            "restore": "恢复便签"
-        }
-        action_name = action_name_map.get(self.log.action_type, self.log.action_type)
-        # time_str = self.log.created_at.strftime("%H:%M")
-        
-        # Only show action name, no time
-        self.meta_lbl = QLabel(f"{action_name}")
-        self.meta_lbl.setStyleSheet("font-size: 11px; background: transparent; border: none;")
-        content_layout.addWidget(self.meta_lbl)
-        
-        self.layout.addLayout(content_layout)
-        self.layout.addStretch()
-
-    def update_style(self):
-        theme = app_config.settings.get("theme", "light_glass")
-        is_dark = (theme == "dark_glass")
-        
-        if is_dark:
-            bg_color = "rgba(255, 255, 255, 0.08)"
-            border_color = "rgba(255, 255, 255, 0.15)"
-            text_primary = "#ffffff"
-            text_secondary = "#rgba(255, 255, 255, 0.6)"
-            hover_bg = "rgba(255, 255, 255, 0.12)"
-        else:
-            bg_color = "rgba(255, 255, 255, 0.6)"
-            border_color = "rgba(255, 255, 255, 0.8)"
-            text_primary = "#333333"
-            text_secondary = "#666666"
-            hover_bg = "rgba(255, 255, 255, 0.8)"
-            
-        self.setStyleSheet(f"""
-            QFrame {{
-                background-color: {bg_color};
-                border: 1px solid {border_color};
-                border-radius: 12px;
-            }}
-            QFrame:hover {{
-                background-color: {hover_bg};
-            }}
-        """)
-        
-        self.content_lbl.setStyleSheet(f"color: {text_primary}; font-weight: 500; background: transparent; border: none;")
-        self.meta_lbl.setStyleSheet(f"color: {text_secondary}; background: transparent; border: none;")
+from ui.widgets.log_list_view import LogListModel, LogItemDelegate, LogListView
 
 class OperationLogWidget(QWidget):
     def __init__(self):
@@ -110,7 +23,7 @@ class OperationLogWidget(QWidget):
         # Spacer to center title (approximate)
         title_layout.addStretch()
         
-        self.title_lbl = QLabel("操作日志 (最近7天)")
+        self.title_lbl = QLabel("操作日志")
         self.title_lbl.setStyleSheet("font-size: 18px; font-weight: bold; color: #333;")
         self.title_lbl.setAlignment(Qt.AlignCenter)
         title_layout.addWidget(self.title_lbl)
@@ -140,20 +53,21 @@ class OperationLogWidget(QWidget):
         
         layout.addLayout(title_layout)
         
-        # Scroll Area
-        self.scroll = QScrollArea()
-        self.scroll.setWidgetResizable(True)
-        self.scroll.setStyleSheet("background: transparent; border: none;")
-        self.scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        
-        self.scroll_content = QWidget()
-        self.scroll_content.setStyleSheet("background: transparent;")
-        self.list_layout = QVBoxLayout(self.scroll_content)
-        self.list_layout.setAlignment(Qt.AlignTop)
-        self.list_layout.setSpacing(5)
-        
-        self.scroll.setWidget(self.scroll_content)
-        layout.addWidget(self.scroll)
+        # Log list (model/view: rows are painted, older pages load while scrolling)
+        self.model = LogListModel(self.manager, parent=self)
+        self.delegate = LogItemDelegate(self)
+        self.list_view = LogListView()
+        self.list_view.setModel(self.model)
+        self.list_view.setItemDelegate(self.delegate)
+        layout.addWidget(self.list_view, 1)
+        
+        self.empty_lbl = QLabel("无操作记录")
+        self.empty_lbl.setAlignment(Qt.AlignCenter)
+        self.empty_lbl.setStyleSheet("color: #888; margin-top: 20px;")
+        layout.addWidget(self.empty_lbl)
+        layout.addStretch()
+        for signal in (self.model.modelReset, self.model.rowsInserted):
+            signal.connect(self.update_empty_state)
         
         self.update_style()
         self.refresh_logs()
@@ -168,63 +82,32 @@ class OperationLogWidget(QWidget):
                 self.refresh_logs()
     
     def refresh_logs(self):
-        # Clear
-        while self.list_layout.count():
-            item = self.list_layout.takeAt(0)
-            widget = item.widget()
-            if widget:
-                widget.setParent(None)
-                
-        # Fetch logs for last 7 days
-        logs = self.manager.get_logs()
-        
-        # Filter in python for last 7 days
-        cutoff = datetime.now() - timedelta(days=7)
-        recent_logs = [log for log in logs if log.created_at >= cutoff]
-        
-        if not recent_logs:
-            empty_lbl = QLabel("无操作记录")
-            empty_lbl.setAlignment(Qt.AlignCenter)
-            empty_lbl.setStyleSheet("color: #888; margin-top: 20px;")
-            self.list_layout.addWidget(empty_lbl)
-        else:
-            # Group by date
-            current_date_str = None
-            today_date = datetime.now().date()
-            
-            for log in recent_logs:
-                log_date_obj = log.created_at.date()
-                log_date_str = log_date_obj.strftime("%Y-%m-%d")
-                
-                if log_date_str != current_date_str:
-                    # Calculate friendly date
-                    delta = (today_date - log_date_obj).days
-                    
-                    if delta == 0:
-                        header_text = "今天"
-                    elif delta > 0:
-                        header_text = f"{delta * -1}" # Shows -1, -2, etc.
-                    else:
-                        header_text = log_date_str # Future date? Should not happen
-                        
-                    # Add Date Header
-                    header = QLabel(header_text)
-                    is_dark = (app_config.settings.get("theme", "light_glass") == "dark_glass")
-                    color = "#aaa" if is_dark else "#666"
-                    header.setStyleSheet(f"color: {color}; font-weight: bold; margin-top: 10px; margin-bottom: 5px;")
-                    self.list_layout.addWidget(header)
-                    current_date_str = log_date_str
-                    
-                item = LogItem(log)
-                self.list_layout.addWidget(item)
+        # Full reload from the newest entry; showing the tab goes through update_logs
+        self.rendered_day = datetime.now().date()
+        self.model.reload()
+
+    def update_logs(self):
+        # Incremental refresh: only entries added since the last read are fetched
+        today = datetime.now().date()
+        if today != self.rendered_day:
+            # Day headers are relative ("今天", "-1", ...) and computed at paint time
+            self.rendered_day = today
+            self.list_view.viewport().update()
+        self.model.update()
+
+    def update_empty_state(self):
+        is_empty = self.model.rowCount() == 0
+        self.empty_lbl.setVisible(is_empty)
+        self.list_view.setVisible(not is_empty)
                 
     def showEvent(self, event):
-        self.refresh_logs()
+        self.update_logs()
         super().showEvent(event)
         
     def update_settings(self):
         self.update_style()
-        self.refresh_logs()
+        self.delegate.update_style()
+        self.list_view.viewport().update()
         
     def update_style(self):
         theme = app_config.settings.get("theme", "light_glass")
@@ -0,0 +1,450 @@
+from PySide6.QtWidgets import QListView, QStyledItemDelegate, QStyle, QLineEdit, QAbstractItemView
+from PySide6.QtCore import (Qt, Signal, QAbstractListModel, QModelIndex, QPersistentModelIndex,
+                            QRect, QRectF, QSize, QTimer, QEvent)
+from PySide6.QtGui import QColor, QFont, QIcon, QPainter, QPen
+from app.config import app_config
+from app.constants import ASSETS_DIR
+from core.models import STATUS_COMPLETED, PRIORITY_HIGH
+import os
+
+ROW_HEIGHT = 50
+ROW_SPACING = 10
+
+def rgba(r, g, b, a):
+    return QColor(r, g, b, int(a * 255))
+
+def brighter(color, step=0.2):
+    # Same idea as the old NoteCard hover stylesheet: just bump the alpha
+    result = QColor(color)
+    result.setAlphaF(min(1.0, color.alphaF() + step))
+    return result
+
+# (background, border, text) per theme and state, mirrors the old NoteCard stylesheets
+CARD_COLORS = {
+    "dark": {
+        "completed": (rgba(80, 80, 80, 0.4), rgba(100, 100, 100, 0.5), QColor("#888")),
+        "urgent": (rgba(139, 0, 0, 0.6), rgba(255, 69, 0, 0.8), QColor("#fff")),
+        "normal": (rgba(60, 60, 60, 0.4), rgba(255, 255, 255, 0.3), QColor("#eee")),
+    },
+    "light": {
+        "completed": (rgba(220, 220, 220, 0.4), rgba(200, 200, 200, 0.5), QColor("#888")),
+        "urgent": (rgba(255, 200, 200, 0.6), rgba(255, 100, 100, 0.8), QColor("#333")),
+        "normal": (rgba(255, 255, 255, 0.5), rgba(255, 255, 255, 0.7), QColor("#333")),
+    },
+}
+
+NOTE_FIELDS = ("title", "content", "color", "status", "priority")
+
+def note_changed(old, new):
+    return any(getattr(old, field) != getattr(new, field) for field in NOTE_FIELDS)
+
+class NoteListModel(QAbstractListModel):
+    NoteIdRole = Qt.UserRole + 1
+    CompletedRole = Qt.UserRole + 2
+    UrgentRole = Qt.UserRole + 3
+
+    title_edited = Signal(int, str) # note_id, new_title
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.notes = []
+        self.store = None
+        self.tooltips = {} # note_id -> text, e.g. search snippets
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.notes)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        note = self.notes[index.row()]
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return note.title or ""
+        if role == self.NoteIdRole:
+            return note.id
+        if role == self.CompletedRole:
+            return note.status == STATUS_COMPLETED
+        if role == self.UrgentRole:
+            return note.priority == PRIORITY_HIGH and note.status != STATUS_COMPLETED
+        if role == Qt.ToolTipRole:
+            return self.tooltips.get(note.id)
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        # The store owns the data; it writes through and reports back via note_updated
+        if not index.isValid() or role != Qt.EditRole:
+            return False
+        note = self.notes[index.row()]
+        if value == note.title:
+            return False
+        self.title_edited.emit(note.id, value)
+        return True
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsEditable
+
+    def set_notes(self, notes):
+        self.beginResetModel()
+        self.notes = list(notes)
+        self.endResetModel()
+
+    def reconcile(self, notes):
+        # Bring the rows in line with `notes` (already in display order) using
+        # remove/move/insert/dataChanged, so unchanged rows and the scroll position
+        # are left alone. Numbers are painted from the row, so they follow for free.
+        new_ids = {note.id for note in notes}
+
+        # 1. Remove rows that are gone, in contiguous ranges from the bottom up
+        row = len(self.notes) - 1
+        while row >= 0:
+            if self.notes[row].id in new_ids:
+                row -= 1
+                continue
+            last = row
+            while row >= 0 and self.notes[row].id not in new_ids:
+                row -= 1
+            self.beginRemoveRows(QModelIndex(), row + 1, last)
+            del self.notes[row + 1:last + 1]
+            self.endRemoveRows()
+
+        # 2. Walk the target order; rows before `i` are already in place
+        current_ids = {note.id for note in self.notes}
+        target_rows = {note.id: row for row, note in enumerate(notes)}
+        i = 0
+        while i < len(notes):
+            note = notes[i]
+            if i < len(self.notes) and self.notes[i].id == note.id:
+                if note_changed(self.notes[i], note):
+                    self.notes[i] = note
+                    index = self.index(i)
+                    self.dataChanged.emit(index, index)
+                i += 1
+                continue
+
+            if note.id not in current_ids:
+                self.beginInsertRows(QModelIndex(), i, i)
+                self.notes.insert(i, note)
+                self.endInsertRows()
+                current_ids.add(note.id)
+                i += 1
+                continue
+
+            source = self.row_of(note.id, start=i + 1)
+            if source == i + 1:
+                # The row sitting at `i` is the one that moved (e.g. a completed
+                # note sinking); move it down once instead of shifting every row up
+                target = min(target_rows[self.notes[i].id], len(self.notes) - 1)
+                self.beginMoveRows(QModelIndex(), i, i, QModelIndex(), target + 1)
+                self.notes.insert(target, self.notes.pop(i))
+                self.endMoveRows()
+                continue
+
+            # Existing row further down: move it up to `i`
+            self.beginMoveRows(QModelIndex(), source, source, QModelIndex(), i)
+            old = self.notes.pop(source)
+            self.notes.insert(i, note)
+            self.endMoveRows()
+            if note_changed(old, note):
+                index = self.index(i)
+                self.dataChanged.emit(index, index)
+            i += 1
+
+    def note_at(self, row):
+        return self.notes[row]
+
+    def row_of(self, note_id, start=0):
+        for row in range(start, len(self.notes)):
+            if self.notes[row].id == note_id:
+                return row
+        return -1
+
+    # --- NoteStore change notifications ---
+
+    def bind_store(self, store):
+        self.store = store
+        store.note_added.connect(self.on_note_added)
+        store.note_updated.connect(self.on_note_updated)
+        store.note_removed.connect(self.on_note_removed)
+        store.note_moved.connect(self.on_note_moved)
+        store.reloaded.connect(self.on_store_reloaded)
+        store.batch_changed.connect(self.on_store_batch_changed)
+
+    def on_note_added(self, summary, row):
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.notes.insert(row, summary)
+        self.endInsertRows()
+
+    def on_note_updated(self, summary, row):
+        if 0 <= row < len(self.notes) and self.notes[row].id == summary.id:
+            self.notes[row] = summary
+            index = self.index(row)
+            self.dataChanged.emit(index, index)
+
+    def on_note_removed(self, note_id, row):
+        if 0 <= row < len(self.notes) and self.notes[row].id == note_id:
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self.notes[row]
+            self.endRemoveRows()
+
+    def on_note_moved(self, note_id, from_row, to_row):
+        # Qt's destination is the row to insert before, counted before the removal
+        destination = to_row + 1 if to_row > from_row else to_row
+        self.beginMoveRows(QModelIndex(), from_row, from_row, QModelIndex(), destination)
+        self.notes.insert(to_row, self.notes.pop(from_row))
+        self.endMoveRows()
+
+    def on_store_reloaded(self):
+        self.reconcile(self.store.all())
+
+    def on_store_batch_changed(self):
+        notes = self.store.all()
+        if {note.id for note in notes} != {note.id for note in self.notes}:
+            self.reconcile(notes)
+            return
+        # Same rows in a new order (e.g. several notes completed at once): one
+        # layout change instead of a move per row; selection follows the notes
+        self.layoutAboutToBeChanged.emit()
+        old_indexes = self.persistentIndexList()
+        old_ids = [self.notes[index.row()].id for index in old_indexes]
+        self.notes = notes
+        rows = {note.id: row for row, note in enumerate(notes)}
+        self.changePersistentIndexList(old_indexes, [self.index(rows[note_id]) for note_id in old_ids])
+        self.layoutChanged.emit()
+
+class NoteItemDelegate(QStyledItemDelegate):
+    completed_toggled = Signal(int, bool) # note_id, is_completed
+    urgent_toggled = Signal(int, bool) # note_id, is_urgent
+    delete_requested = Signal(int) # note_id
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.trash_icon = QIcon()
+        trash_icon_path = os.path.join(ASSETS_DIR, "icon_trash.svg")
+        if os.path.exists(trash_icon_path):
+            self.trash_icon = QIcon(trash_icon_path)
+
+        # One long press timer for the whole list instead of one per card
+        self.pressed_index = None
+        self.editing_index = None
+        self.long_press_fired = False
+        self.long_press_timer = QTimer(self)
+        self.long_press_timer.setSingleShot(True)
+        self.long_press_timer.setInterval(800)
+        self.long_press_timer.timeout.connect(self.on_long_press)
+
+        self.update_style()
+
+    def update_style(self):
+        theme = app_config.settings.get("theme", "light_glass")
+        self.is_dark = (theme == "dark_glass")
+        self.colors = CARD_COLORS["dark" if self.is_dark else "light"]
+        self.num_color = QColor("#aaa" if self.is_dark else "#888")
+        self.check_border = QColor("#888" if self.is_dark else "#999")
+        self.check_bg = rgba(255, 255, 255, 0.2 if self.is_dark else 0.5)
+
+    # --- Geometry (same layout as the old NoteCard) ---
+
+    def card_rect(self, option):
+        return option.rect.adjusted(2, ROW_SPACING // 2, -2, -ROW_SPACING // 2)
+
+    def checkbox_rect(self, option):
+        card = self.card_rect(option)
+        return QRect(card.left() + 10, card.center().y() - 9, 18, 18)
+
+    def number_rect(self, option):
+        card = self.card_rect(option)
+        return QRect(card.left() + 35, card.top(), 20, card.height())
+
+    def delete_rect(self, option):
+        card = self.card_rect(option)
+        return QRect(card.right() - 35, card.center().y() - 15, 30, 30)
+
+    def title_rect(self, option):
+        card = self.card_rect(option)
+        left = card.left() + 60
+        return QRect(left, card.top(), self.delete_rect(option).left() - 5 - left, card.height())
+
+    def actions_visible(self, option):
+        settings = app_config.settings.get("window", {})
+        if settings.get("show_note_actions", True):
+            return True
+        return bool(option.state & QStyle.State_MouseOver)
+
+    # --- Painting ---
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), ROW_HEIGHT + ROW_SPACING)
+
+    def paint(self, painter, option, index):
+        is_completed = index.data(NoteListModel.CompletedRole)
+        is_urgent = index.data(NoteListModel.UrgentRole)
+        hovered = bool(option.state & QStyle.State_MouseOver)
+        selected = bool(option.state & QStyle.State_Selected)
+
+        if is_completed:
+            bg_color, border_color, text_color = self.colors["completed"]
+        elif is_urgent:
+            bg_color, border_color, text_color = self.colors["urgent"]
+        else:
+            bg_color, border_color, text_color = self.colors["normal"]
+        if hovered or selected:
+            bg_color = brighter(bg_color)
+            border_color = brighter(border_color)
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        # Card
+        painter.setPen(QPen(border_color, 1))
+        painter.setBrush(bg_color)
+        painter.drawRoundedRect(QRectF(self.card_rect(option)).adjusted(0.5, 0.5, -0.5, -0.5), 10, 10)
+
+        # Checkbox
+        check = QRectF(self.checkbox_rect(option))
+        if is_completed:
+            painter.setPen(QPen(QColor("#4CAF50"), 1))
+            painter.setBrush(QColor("#4CAF50"))
+        else:
+            painter.setPen(QPen(self.check_border, 1))
+            painter.setBrush(self.check_bg)
+        painter.drawEllipse(check)
+
+        # Number
+        font = QFont(option.font)
+        font.setPixelSize(14)
+        font.setBold(True)
+        painter.setFont(font)
+        painter.setPen(self.num_color)
+        painter.drawText(self.number_rect(option), Qt.AlignCenter, str(index.row() + 1))
+
+        # Title (skipped while the inline editor is open on top of it)
+        if self.editing_index is None or self.editing_index != index:
+            font.setBold(not is_completed)
+            font.setStrikeOut(is_completed)
+            painter.setFont(font)
+            painter.setPen(text_color)
+            title_rect = self.title_rect(option)
+            text = painter.fontMetrics().elidedText(index.data(Qt.DisplayRole), Qt.ElideRight, title_rect.width())
+            painter.drawText(title_rect, Qt.AlignLeft | Qt.AlignVCenter, text)
+
+        # Delete button
+        if self.actions_visible(option):
+            button = QRectF(self.delete_rect(option))
+            painter.setPen(QPen(rgba(150, 150, 150, 0.2), 1))
+            painter.setBrush(rgba(255, 255, 255, 0.5))
+            painter.drawRoundedRect(button, 5, 5)
+            if not self.trash_icon.isNull():
+                self.trash_icon.paint(painter, self.delete_rect(option).adjusted(6, 6, -6, -6))
+
+        painter.restore()
+
+    # --- Inline title editing ---
+
+    def createEditor(self, parent, option, index):
+        editor = QLineEdit(parent)
+        editor.setPlaceholderText("请输入内容...")
+        editor.setFrame(False)
+        is_completed = index.data(NoteListModel.CompletedRole)
+        if is_completed:
+            text_color = "#888"
+        else:
+            text_color = "#eee" if self.is_dark else "#333"
+        weight = "normal" if is_completed else "bold"
+        editor.setStyleSheet(f"border: none; background: transparent; font-size: 14px; "
+                             f"font-weight: {weight}; color: {text_color};")
+        # Long press still works while the title is being edited
+        editor.installEventFilter(self)
+        editor.setProperty("note_index", QPersistentModelIndex(index))
+        self.editing_index = QPersistentModelIndex(index)
+        return editor
+
+    def destroyEditor(self, editor, index):
+        self.editing_index = None
+        super().destroyEditor(editor, index)
+
+    def setEditorData(self, editor, index):
+        editor.setText(index.data(Qt.EditRole))
+
+    def setModelData(self, editor, model, index):
+        model.setData(index, editor.text(), Qt.EditRole)
+
+    def updateEditorGeometry(self, editor, option, index):
+        editor.setGeometry(self.title_rect(option))
+
+    def eventFilter(self, obj, event):
+        if isinstance(obj, QLineEdit):
+            if event.type() == QEvent.MouseButtonPress and event.button() == Qt.LeftButton:
+                self.start_long_press(obj.property("note_index"))
+            elif event.type() == QEvent.MouseButtonRelease:
+                self.long_press_timer.stop()
+        return super().eventFilter(obj, event)
+
+    # --- Mouse handling: checkbox, delete button and long press ---
+
+    def editorEvent(self, event, model, option, index):
+        event_type = event.type()
+        if event_type not in (QEvent.MouseButtonPress, QEvent.MouseButtonRelease,
+                              QEvent.MouseButtonDblClick):
+            return super().editorEvent(event, model, option, index)
+        if event.button() != Qt.LeftButton:
+            return False
+
+        pos = event.position().toPoint()
+        note_id = index.data(NoteListModel.NoteIdRole)
+        on_checkbox = self.checkbox_rect(option).adjusted(-4, -4, 4, 4).contains(pos)
+        on_delete = self.actions_visible(option) and self.delete_rect(option).contains(pos)
+
+        if event_type == QEvent.MouseButtonPress:
+            self.long_press_fired = False
+            if not (on_checkbox or on_delete):
+                self.start_long_press(index)
+                return False
+            return True
+
+        if event_type == QEvent.MouseButtonDblClick:
+            # Don't open the editor when double clicking a button
+            return on_checkbox or on_delete
+
+        # Release
+        self.long_press_timer.stop()
+        if self.long_press_fired:
+            # Swallow the release so it doesn't also start editing
+            self.long_press_fired = False
+            return True
+        if on_checkbox:
+            self.completed_toggled.emit(note_id, not index.data(NoteListModel.CompletedRole))
+            return True
+        if on_delete:
+            self.delete_requested.emit(note_id)
+            return True
+        return False
+
+    def start_long_press(self, index):
+        self.pressed_index = QPersistentModelIndex(index)
+        self.long_press_timer.start()
+
+    def on_long_press(self):
+        index = self.pressed_index
+        if index is None or not index.isValid():
+            return
+        self.long_press_fired = True
+        is_urgent = not index.data(NoteListModel.UrgentRole)
+        self.urgent_toggled.emit(index.data(NoteListModel.NoteIdRole), is_urgent)
+
+class NoteListView(QListView):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setMouseTracking(True) # Hover actions
+        self.setUniformItemSizes(True) # Lets Qt skip per-row size queries
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setEditTriggers(QAbstractItemView.SelectedClicked | QAbstractItemView.DoubleClicked |
+                             QAbstractItemView.EditKeyPressed)
+        # Ctrl/Shift-click to pick several notes for batch actions
+        self.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.setFrameShape(QListView.NoFrame)
+        self.setStyleSheet("QListView { background: transparent; border: none; outline: none; }"
+                           "QListView::item { background: transparent; border: none; }")
+        self.viewport().setAttribute(Qt.WA_Hover)
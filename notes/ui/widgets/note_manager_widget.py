@@ -1,55 +1,82 @@
-from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
-                                 QScrollArea, QFrame, QGraphicsOpacityEffect, QLineEdit, QLabel)
-from PySide6.QtCore import Qt, QTimer, QPropertyAnimation, QEasingCurve
-from core.note_manager import NoteManager
-from ui.widgets.note_card import NoteCard
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QLineEdit, QLabel, QMessageBox, QMenu
+from PySide6.QtCore import Qt, QTimer
+from PySide6.QtGui import QAction, QKeySequence, QShortcut
+from core.note_store import get_note_store
+from core.db_worker import get_db_worker
+from ui.widgets.note_list_view import NoteListModel, NoteItemDelegate, NoteListView
 from app.config import app_config
 
 class NoteManagerWidget(QWidget):
     def __init__(self):
         super().__init__()
-        self.manager = NoteManager()
+        self.store = get_note_store()
+        self.store.write_failed.connect(self.on_write_failed)
         self.init_ui()
         self.refresh_notes()
         
     def init_ui(self):
         layout = QVBoxLayout(self)
-        layout.setContentsMargins(0, 0, 0, 0)
-        
-        # Scroll Area for Notes (List View)
-        self.scroll = QScrollArea()
-        self.scroll.setWidgetResizable(True)
-        self.scroll.setStyleSheet("background: transparent; border: none;")
-        self.scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        
-        self.scroll_content = QWidget()
-        self.scroll_content.setStyleSheet("background: transparent;")
-        
-        # Use QVBoxLayout for list
-        self.list_layout = QVBoxLayout(self.scroll_content)
-        self.list_layout.setAlignment(Qt.AlignTop)
-        self.list_layout.setSpacing(10)
-        self.list_layout.setContentsMargins(10, 10, 10, 10)
+        layout.setContentsMargins(10, 10, 10, 10)
+        layout.setSpacing(10)
         
         # 1. Page Title "待办"
         self.title_label = QLabel("待办")
         self.title_label.setAlignment(Qt.AlignCenter)
         self.title_label.setStyleSheet("font-size: 20px; font-weight: bold; color: #333; margin-bottom: 5px;")
-        self.list_layout.addWidget(self.title_label)
+        layout.addWidget(self.title_label)
         
         # 2. Input Field
         self.input_edit = QLineEdit()
         self.input_edit.setPlaceholderText("请输入待办事项，回车创建...")
         self.input_edit.setFixedHeight(40)
         self.input_edit.returnPressed.connect(self.on_input_return_pressed)
+        layout.addWidget(self.input_edit)
+        
+        # Search Field (as-you-type, debounced; queries run on the database worker)
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("搜索便签...")
+        self.search_edit.setFixedHeight(32)
+        self.search_edit.setClearButtonEnabled(True)
+        self.search_edit.textChanged.connect(self.on_search_text_changed)
+        layout.addWidget(self.search_edit)
+        
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(150)
+        self.search_timer.timeout.connect(self.run_search)
+        self.search_serial = 0
         
         # Initial style check
         self.update_input_style()
         
-        self.list_layout.addWidget(self.input_edit)
-        
-        self.scroll.setWidget(self.scroll_content)
-        layout.addWidget(self.scroll)
+        # 3. Note list (model/view: rows are painted, only the edited row gets a widget)
+        self.model = NoteListModel(self)
+        self.model.bind_store(self.store)
+        self.model.title_edited.connect(self.update_note_title)
+        
+        self.delegate = NoteItemDelegate(self)
+        self.delegate.urgent_toggled.connect(self.update_note_urgency)
+        self.delegate.completed_toggled.connect(self.update_note_completion)
+        self.delegate.delete_requested.connect(self.delete_note)
+        
+        # Search results reuse the same view and delegate with their own model
+        self.search_model = NoteListModel(self)
+        self.search_model.title_edited.connect(self.update_note_title)
+        for signal in (self.store.note_added, self.store.note_updated, self.store.note_removed,
+                       self.store.reloaded, self.store.batch_changed):
+            signal.connect(self.on_store_changed)
+        
+        self.list_view = NoteListView()
+        self.list_view.setModel(self.model)
+        self.list_view.setItemDelegate(self.delegate)
+        layout.addWidget(self.list_view, 1)
+        
+        # Batch actions on the selected notes (right click / Delete key)
+        self.list_view.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.list_view.customContextMenuRequested.connect(self.show_batch_menu)
+        self.delete_shortcut = QShortcut(QKeySequence.Delete, self.list_view)
+        self.delete_shortcut.setContext(Qt.WidgetShortcut)
+        self.delete_shortcut.activated.connect(self.delete_selected)
 
     def update_input_style(self):
         theme = app_config.settings.get("theme", "light_glass")
@@ -87,106 +114,125 @@ class NoteManagerWidget(QWidget):
                     border: 1px solid rgba(0,0,0,0.2);
                 }
             """)
+        # The search box shares the input field's look
+        self.search_edit.setStyleSheet(self.input_edit.styleSheet())
 
     def on_input_return_pressed(self):
         text = self.input_edit.text().strip()
         if text:
-            # Create new note with this text
-            note = self.manager.create_note(text, "")
+            # Create new note with this text; the store inserts its row
+            self.store.create(text, "")
             
             # Clear input
             self.input_edit.clear()
             
-            # Refresh list
-            self.refresh_notes()
-            
             # Focus back to input
             self.input_edit.setFocus()
         
-    def add_note_card(self, note, index):
-        card = NoteCard(note.id, index, note.title, note.content, note.color)
-        card.title_changed.connect(self.update_note_title)
-        card.urgent_changed.connect(self.update_note_urgency)
-        card.completed_changed.connect(self.update_note_completion)
-        card.deleted.connect(self.delete_note)
-        
-        # New Note Animation (Fade In)
-        # We can't animate geometry easily in layout without doing it before adding to layout
-        # Instead, let's use window opacity for fade-in
-        # Only animate if it's very new (created just now)? 
-        # For simplicity, we skip animation on load, but we can check note timestamp if needed.
-        # But here we just add it.
-        
-        self.list_layout.addWidget(card)
-        return card
-
     def update_note_title(self, note_id, new_title):
-        note = self.manager.get_note(note_id)
-        if note:
-            self.manager.update_note(note_id, new_title, note.content)
+        self.store.set_title(note_id, new_title)
 
     def update_note_urgency(self, note_id, is_urgent):
-        note = self.manager.get_note(note_id)
-        if note:
-            new_color = "#ffcccc" if is_urgent else "#ffffff" 
-            self.manager.update_note(note_id, note.title, note.content, new_color)
+        self.store.set_urgent(note_id, is_urgent)
 
     def update_note_completion(self, note_id, is_completed):
-        note = self.manager.get_note(note_id)
-        if note:
-            new_color = "#e0e0e0" if is_completed else "#ffffff"
-            self.manager.update_note(note_id, note.title, note.content, new_color)
-            
-            # Find the card
-            card = None
-            for i in range(self.list_layout.count()):
-                item = self.list_layout.itemAt(i)
-                w = item.widget()
-                if isinstance(w, NoteCard) and w.note_id == note_id:
-                    card = w
-                    break
-            
-            if card:
-                # Fade out animation before refresh
-                opacity_effect = QGraphicsOpacityEffect(card)
-                card.setGraphicsEffect(opacity_effect)
-                anim = QPropertyAnimation(opacity_effect, b"opacity")
-                anim.setDuration(300)
-                anim.setStartValue(1)
-                anim.setEndValue(0)
-                anim.setEasingCurve(QEasingCurve.InQuad)
-                anim.finished.connect(self.refresh_notes) # Refresh after fade out to re-sort
-                anim.start(QPropertyAnimation.DeleteWhenStopped)
-            else:
-                self.refresh_notes()
+        self.store.set_completed(note_id, is_completed)
 
     def delete_note(self, note_id):
-        print(f"DEBUG: Attempting to delete note {note_id}")
-        # Simplest, most robust delete implementation (Hard Delete)
-        success = self.manager.delete_note(note_id)
-        if success:
-            print(f"DEBUG: Successfully deleted note {note_id}")
-            # Refresh immediately to sync UI with DB
-            self.refresh_notes()
-        else:
-            print(f"DEBUG: Failed to delete note {note_id}")
+        # Hard delete; the store removes the row on success
+        if not self.store.delete(note_id):
+            print(f"Failed to delete note {note_id}")
     
+    # --- Batch actions ---
+
+    def selected_note_ids(self):
+        indexes = self.list_view.selectionModel().selectedIndexes()
+        return [index.data(NoteListModel.NoteIdRole) for index in sorted(indexes, key=lambda i: i.row())]
+
+    def show_batch_menu(self, pos):
+        index = self.list_view.indexAt(pos)
+        if index.isValid() and not self.list_view.selectionModel().isSelected(index):
+            self.list_view.setCurrentIndex(index)
+        note_ids = self.selected_note_ids()
+        if not note_ids:
+            return
+        
+        menu = QMenu(self)
+        count = len(note_ids)
+        actions = [
+            (f"完成所选 ({count})", lambda: self.store.complete_many(note_ids)),
+            ("标记为紧急", lambda: self.store.set_urgent_many(note_ids, True)),
+            ("取消紧急", lambda: self.store.set_urgent_many(note_ids, False)),
+            (f"删除所选 ({count})", self.delete_selected),
+        ]
+        for text, handler in actions:
+            action = QAction(text, menu)
+            action.triggered.connect(handler)
+            menu.addAction(action)
+        menu.exec(self.list_view.viewport().mapToGlobal(pos))
+
+    def delete_selected(self):
+        note_ids = self.selected_note_ids()
+        if not note_ids:
+            return
+        if len(note_ids) > 1:
+            reply = QMessageBox.question(self, "删除便签", f"确定删除选中的 {len(note_ids)} 条便签吗？")
+            if reply != QMessageBox.Yes:
+                return
+        self.store.delete_many(note_ids)
+
+    # --- Search ---
+
+    def is_searching(self):
+        return bool(self.search_edit.text().strip())
+
+    def on_search_text_changed(self, text):
+        if text.strip():
+            self.search_timer.start()
+        else:
+            self.search_timer.stop()
+            self.search_serial += 1 # Drop results still in flight
+            self.list_view.setModel(self.model)
+
+    def on_store_changed(self, *args):
+        # Keep visible results current after edits made from the results list
+        if self.is_searching():
+            self.search_timer.start()
+
+    def run_search(self):
+        query = self.search_edit.text().strip()
+        if not query:
+            return
+        self.search_serial += 1
+        serial = self.search_serial
+        get_db_worker().submit(
+            self.store.manager.search, query, 200,
+            on_success=lambda results: self.show_search_results(serial, results),
+        )
+
+    def show_search_results(self, serial, results):
+        if serial != self.search_serial or not self.is_searching():
+            return # A newer query superseded this one
+        notes = []
+        self.search_model.tooltips = {}
+        for result in results:
+            summary = self.store.get(result["id"]) if result["kind"] == "note" else None
+            if summary is not None:
+                notes.append(summary)
+                self.search_model.tooltips[summary.id] = result["snippet"]
+        self.search_model.reconcile(notes)
+        if self.list_view.model() is not self.search_model:
+            self.list_view.setModel(self.search_model)
+
+    def on_write_failed(self, message):
+        # The store has already put the list back to what is on disk
+        QMessageBox.warning(self, "保存失败", f"便签保存失败，已撤销本次修改。\n{message}")
+
     def refresh_notes(self):
-        # Clear existing items but KEEP the Title and Input
-        # Items 0 and 1 are Title and Input
-        # We start removing from index 2
-        
-        while self.list_layout.count() > 2:
-            item = self.list_layout.takeAt(2)
-            widget = item.widget()
-            if widget:
-                widget.deleteLater() # Properly destroy widget
-        
-        notes = self.manager.get_all_notes()
-        
-        # Add notes as list items
-        for i, note in enumerate(notes, 1):
-             self.add_note_card(note, i) 
+        # Reload from the database; the model diffs against the rows already shown
+        self.store.load()
              
     def update_settings(self):
         self.update_input_style()
+        self.delegate.update_style()
+        self.list_view.viewport().update()